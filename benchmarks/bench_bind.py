@@ -0,0 +1,81 @@
+"""
+Cost of reading a document with several models: each model parsing the
+document with create_from_bytes(), against xmlmodels.bind() parsing it
+once for all of them.
+
+The models are the suite's BenchFeed, a model of the feed's metadata and
+a model auditing the entries' links, each reading one field.
+
+Usage:
+
+    python -m benchmarks.bench_bind [--entries 1000] [--repeat 5]
+"""
+
+import argparse
+import functools
+import timeit
+
+from djxml import xmlmodels
+
+from .documents import make_atom_feed
+from .models import BenchFeed
+
+NAMESPACES = {
+    "atom": "http://www.w3.org/2005/Atom",
+}
+
+
+class BenchFeedMetadata(xmlmodels.XmlModel):
+    class Meta:
+        app_label = "benchmarks"
+        namespaces = NAMESPACES
+
+    feed_id = xmlmodels.XPathTextField("/atom:feed/atom:id")
+    updated = xmlmodels.XPathDateTimeField("/atom:feed/atom:updated")
+
+
+class BenchLinkAudit(xmlmodels.XmlModel):
+    class Meta:
+        app_label = "benchmarks"
+        namespaces = NAMESPACES
+
+    hrefs = xmlmodels.XPathTextListField("/atom:feed/atom:entry/atom:link/@href")
+
+
+MODELS = (
+    (BenchFeed, "title"),
+    (BenchFeedMetadata, "feed_id"),
+    (BenchLinkAudit, "hrefs"),
+)
+
+
+def parse_per_model(xml_bytes):
+    for model, name in MODELS:
+        getattr(model.create_from_bytes(xml_bytes), name)
+
+
+def parse_once(xml_bytes):
+    instances = xmlmodels.bind(xml_bytes, *[model for model, name in MODELS])
+    for instance, (model, name) in zip(instances, MODELS):
+        getattr(instance, name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    xml_bytes = make_atom_feed(args.entries)
+    for label, func in (
+        ("create_from_bytes() per model", parse_per_model),
+        ("xmlmodels.bind()", parse_once),
+    ):
+        timer = timeit.Timer(functools.partial(func, xml_bytes))
+        best = min(timer.repeat(repeat=args.repeat, number=args.number)) / args.number
+        print("%-30s %10.1f us/document" % (label, best * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Cost of an XPathDateTimeListField on a document with 100k timestamps.
+
+Compares parsing every value with dateutil.parser.parse(), which is what
+parse_datetime() did previously, against the fromisoformat() fast path and
+an explicit format="iso8601".
+
+Usage:
+
+    python -m benchmarks.bench_datetime [--timestamps 100000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import dateutil.parser
+
+from djxml import xmlmodels
+
+
+class DatesModel(xmlmodels.XmlModel):
+    class Meta:
+        app_label = "benchmarks"
+
+    dates = xmlmodels.XPathDateTimeListField("/doc/t")
+    iso_dates = xmlmodels.XPathDateTimeListField("/doc/t", format="iso8601")
+    texts = xmlmodels.XPathTextListField("/doc/t")
+
+
+def make_document(num_timestamps, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2012, 7, 5, 18, 30, 2)
+    values = (
+        (start + timedelta(seconds=rng.randint(0, 10**8))).isoformat() + "Z"
+        for _ in range(num_timestamps)
+    )
+    return "<doc>%s</doc>" % "".join("<t>%s</t>" % v for v in values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--timestamps", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    root = DatesModel.create_from_string(make_document(args.timestamps)).root
+
+    def dateutil_only():
+        return [dateutil.parser.parse(v) for v in DatesModel(root).texts]
+
+    for label, func in (
+        ("dateutil.parser.parse", dateutil_only),
+        ("format=None (fast path)", lambda: DatesModel(root).dates),
+        ('format="iso8601"', lambda: DatesModel(root).iso_dates),
+    ):
+        start = time.perf_counter()
+        func()
+        print("%-26s %8.1f ms" % (label, (time.perf_counter() - start) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Bytes per XmlModel instance, with and without Meta.compact.
+
+Creates an instance per entry of a generated Atom feed (as
+EmbeddedXPathListField does), reads every field, and reports the memory
+allocated per instance as measured by tracemalloc. The parsed tree is
+created before measuring, so only the instances and their field values are
+counted.
+
+Usage:
+
+    python -m benchmarks.bench_memory [--entries 200000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from djxml import xmlmodels
+
+from .documents import make_atom_feed
+from .models import BenchEntry, BenchFeed
+
+
+class CompactBenchEntry(xmlmodels.XmlModel):
+    class Meta:
+        app_label = "benchmarks"
+        compact = True
+        namespaces = {
+            "atom": "http://www.w3.org/2005/Atom",
+        }
+
+    title = xmlmodels.XPathTextField("atom:title")
+    count = xmlmodels.XPathIntegerField("atom:count")
+    updated = xmlmodels.XPathDateTimeField("atom:updated")
+
+
+def measure(model, elements, read_fields):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [model(element) for element in elements]
+    if read_fields:
+        for instance in instances:
+            instance.title, instance.count, instance.updated
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del instances
+    return used / len(elements)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200000)
+    args = parser.parse_args(argv)
+
+    feed = BenchFeed.create_from_bytes(make_atom_feed(args.entries))
+    elements = feed.xpath("/atom:feed/atom:entry")
+    print("%d instances" % len(elements))
+    for read_fields in (False, True):
+        for model in (BenchEntry, CompactBenchEntry):
+            print(
+                "%-18s %-18s %8.1f bytes/instance"
+                % (
+                    model.__name__,
+                    "fields read" if read_fields else "fields not read",
+                    measure(model, elements, read_fields),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Multi-threaded parsing throughput of XmlModel.create_from_string.
+
+Compares every thread sharing one lxml.etree.XMLParser serialized behind a
+lock, which is what callers had to do when Options.get_parser() returned a
+single parser for the model, against each thread using its own parser from
+Options.get_parser().
+
+Usage:
+
+    python -m benchmarks.bench_parser_threads [--threads 4] [--documents 400]
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from djxml import xmlmodels
+
+
+class ThreadsModel(xmlmodels.XmlModel):
+    class Meta:
+        app_label = "benchmarks"
+
+    first = xmlmodels.XPathTextField("/doc/item[1]/value")
+
+
+def make_document(num_items):
+    items = "".join("<item><value>value %d</value></item>" % i for i in range(num_items))
+    return "<doc>%s</doc>" % items
+
+
+def run(num_threads, num_documents, xml_source, parse):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        for _ in executor.map(parse, [xml_source] * num_documents):
+            pass
+    return num_documents / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--documents", type=int, default=400)
+    parser.add_argument("--items", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    xml_source = make_document(args.items)
+    shared_parser = ThreadsModel._meta.create_parser()
+    lock = threading.Lock()
+
+    def parse_shared(source):
+        with lock:
+            return ThreadsModel.create_from_string(source, parser=shared_parser).first
+
+    def parse_per_thread(source):
+        return ThreadsModel.create_from_string(source).first
+
+    for label, parse in (
+        ("shared parser behind a lock", parse_shared),
+        ("parser per thread", parse_per_thread),
+    ):
+        rate = run(args.threads, args.documents, xml_source, parse)
+        print("%-28s %8.1f documents/s (%d threads)" % (label, rate, args.threads))
+
+
+if __name__ == "__main__":
+    main()
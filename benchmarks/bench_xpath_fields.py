@@ -0,0 +1,90 @@
+"""
+Per-document cost of evaluating every field on a 50-field xml model.
+
+Compares the precompiled lxml.etree.XPath objects that XPathFields carry
+since being prepared with their model, against building an
+lxml.etree.XPathEvaluator (plus namespace and extension dicts) for each
+field access, which is what the descriptor did previously.
+
+Usage:
+
+    python -m benchmarks.bench_xpath_fields [--fields 50] [--repeat 5]
+"""
+
+import argparse
+import functools
+import timeit
+
+from lxml import etree
+
+from djxml import xmlmodels
+
+
+def make_model(num_fields):
+    class Meta:
+        app_label = "benchmarks"
+        extension_ns_uri = "urn:local:bench-functions"
+        namespaces = {"fn": extension_ns_uri}
+
+    attrs = {"__module__": __name__, "Meta": Meta}
+    for i in range(num_fields):
+        attrs["field_%d" % i] = xmlmodels.XPathTextField("/doc/item[%d]/value" % (i + 1))
+
+    @xmlmodels.lxml_extension
+    def upper(self, context, value):
+        return value.upper()
+
+    attrs["upper"] = upper
+    return type("BenchModel%d" % num_fields, (xmlmodels.XmlModel,), attrs)
+
+
+def make_document(num_fields):
+    items = "".join("<item><value>value %d</value></item>" % i for i in range(num_fields))
+    return "<doc>%s</doc>" % items
+
+
+def evaluate_compiled(model, field_names, xml_source):
+    instance = model.create_from_string(xml_source)
+    for name in field_names:
+        getattr(instance, name)
+
+
+def evaluate_uncompiled(model, field_names, xml_source):
+    instance = model.create_from_string(xml_source)
+    opts = model._meta
+    tree = instance._get_etree_val()
+    for name in field_names:
+        field = opts.get_field(name)
+        namespaces = {}
+        namespaces.update(opts.namespaces)
+        namespaces.update(field.extra_namespaces)
+        extensions = {
+            k: functools.partial(method, instance) for k, method in opts.extensions.items()
+        }
+        extensions.update(field.extensions)
+        xpath_eval = etree.XPathEvaluator(tree, namespaces=namespaces, extensions=extensions)
+        field.clean(xpath_eval(field.xpath_query), instance)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fields", type=int, default=50)
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    model = make_model(args.fields)
+    xml_source = make_document(args.fields)
+    field_names = ["field_%d" % i for i in range(args.fields)]
+
+    for label, func in (
+        ("XPathEvaluator per access", evaluate_uncompiled),
+        ("precompiled etree.XPath", evaluate_compiled),
+    ):
+        timer = timeit.Timer(functools.partial(func, model, field_names, xml_source))
+        best = min(timer.repeat(repeat=args.repeat, number=args.number)) / args.number
+        print("%-28s %8.1f us/document" % (label, best * 1e6))
+
+
+if __name__ == "__main__":
+    main()
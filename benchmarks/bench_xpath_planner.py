@@ -0,0 +1,71 @@
+"""
+Per-document cost of evaluating fields which share a searching XPath
+prefix, with and without the planner (Meta.xpath_planner).
+
+The fields of the model select the title, id, updated date and count of
+the entry with a given id. With the planner, the prefix selecting that
+entry is evaluated once per document and each field only evaluates its
+step relative to the entry; without it, every field searches the feed.
+
+Usage:
+
+    python -m benchmarks.bench_xpath_planner [--entries 1000] [--repeat 5]
+"""
+
+import argparse
+import functools
+import timeit
+
+from djxml import xmlmodels
+
+from .documents import make_atom_feed
+
+ENTRY = "//atom:entry[atom:id='urn:uuid:entry-%d']"
+
+
+def make_model(name, entry_index, xpath_planner):
+    class Meta:
+        app_label = "benchmarks"
+        namespaces = {
+            "atom": "http://www.w3.org/2005/Atom",
+        }
+
+    Meta.xpath_planner = xpath_planner
+    entry = ENTRY % entry_index
+    attrs = {
+        "__module__": __name__,
+        "Meta": Meta,
+        "title": xmlmodels.XPathTextField(entry + "/atom:title"),
+        "entry_id": xmlmodels.XPathTextField(entry + "/atom:id"),
+        "updated": xmlmodels.XPathDateTimeField(entry + "/atom:updated"),
+        "count": xmlmodels.XPathIntegerField(entry + "/atom:count"),
+    }
+    return type(name, (xmlmodels.XmlModel,), attrs)
+
+
+def evaluate(model, root):
+    instance = model(root)
+    return instance.title, instance.entry_id, instance.updated, instance.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    entry_index = args.entries // 2
+    planned = make_model("PlannedEntry", entry_index, True)
+    unplanned = make_model("UnplannedEntry", entry_index, False)
+    root = planned.create_from_bytes(make_atom_feed(args.entries)).root
+    assert evaluate(planned, root) == evaluate(unplanned, root)
+
+    for label, model in (("each query", unplanned), ("shared prefix", planned)):
+        timer = timeit.Timer(functools.partial(evaluate, model, root))
+        best = min(timer.repeat(repeat=args.repeat, number=args.number)) / args.number
+        print("%-16s %10.1f us/document" % (label, best * 1e6))
+
+
+if __name__ == "__main__":
+    main()
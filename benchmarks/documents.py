@@ -0,0 +1,61 @@
+"""
+Generators for the synthetic documents used by the benchmarks.
+
+Documents are built from a seeded random.Random so that every run of a
+given size parses exactly the same bytes.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua"
+).split()
+
+
+def make_atom_feed(num_entries, seed=0):
+    """
+    Return the bytes of an Atom feed with num_entries entries. Each entry has
+    a title, id, updated date, a word count and an xhtml summary with mixed
+    content.
+    """
+    rng = random.Random(seed)
+    start = datetime(2012, 7, 5, 18, 30, 2)
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n',
+        '<feed xmlns="%s" xmlns:xhtml="%s">\n' % (ATOM_NS, XHTML_NS),
+        "<title>Benchmark Feed</title>\n",
+        '<link rel="alternate" href="http://example.org/"/>\n',
+        "<updated>%sZ</updated>\n" % start.isoformat(),
+        "<id>urn:uuid:feed-%d</id>\n" % seed,
+    ]
+    for i in range(num_entries):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(20, 60))]
+        updated = start - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        parts.append(
+            "<entry>"
+            "<title>%(title)s</title>"
+            '<link rel="alternate" href="http://example.org/entries/%(i)d"/>'
+            "<id>urn:uuid:entry-%(i)d</id>"
+            "<updated>%(updated)sZ</updated>"
+            "<count>%(count)d</count>"
+            '<summary type="xhtml"><xhtml:div><xhtml:p>%(first)s</xhtml:p>'
+            "<xhtml:p>%(second)s<xhtml:br/><xhtml:em>%(third)s</xhtml:em></xhtml:p>"
+            "</xhtml:div></summary>"
+            "</entry>\n"
+            % {
+                "i": i,
+                "title": " ".join(words[:5]),
+                "updated": updated.isoformat(),
+                "count": len(words),
+                "first": " ".join(words[:10]),
+                "second": " ".join(words[10:20]),
+                "third": " ".join(words[20:]),
+            }
+        )
+    parts.append("</feed>\n")
+    return "".join(parts).encode("utf-8")
@@ -0,0 +1,77 @@
+"""
+Xml models exercising each field type, used by the benchmark suite.
+"""
+
+from djxml import xmlmodels
+
+ATOM2RSS_XSLT = """
+<xsl:stylesheet version="1.0"
+    xmlns:xsl="http://www.w3.org/1999/XSL/Transform"
+    xmlns:atom="http://www.w3.org/2005/Atom"
+    exclude-result-prefixes="atom">
+  <xsl:output method="xml" encoding="utf-8"/>
+  <xsl:template match="/atom:feed">
+    <rss version="2.0">
+      <channel>
+        <title><xsl:value-of select="atom:title"/></title>
+        <xsl:for-each select="atom:entry">
+          <item>
+            <title><xsl:value-of select="atom:title"/></title>
+            <guid><xsl:value-of select="atom:id"/></guid>
+            <link><xsl:value-of select="atom:link[@rel='alternate']/@href"/></link>
+          </item>
+        </xsl:for-each>
+      </channel>
+    </rss>
+  </xsl:template>
+</xsl:stylesheet>
+"""
+
+FEED_SCHEMATRON = """
+<schema xmlns="http://purl.oclc.org/dsdl/schematron">
+  <ns prefix="atom" uri="http://www.w3.org/2005/Atom"/>
+  <pattern>
+    <rule context="atom:entry">
+      <assert test="atom:title">An entry must have a title</assert>
+      <assert test="atom:id">An entry must have an id</assert>
+      <assert test="number(atom:count) &gt; 0">An entry must have a positive count</assert>
+    </rule>
+  </pattern>
+</schema>
+"""
+
+
+class BenchEntry(xmlmodels.XmlModel):
+    class Meta:
+        app_label = "benchmarks"
+        namespaces = {
+            "atom": "http://www.w3.org/2005/Atom",
+        }
+
+    title = xmlmodels.XPathTextField("atom:title")
+    count = xmlmodels.XPathIntegerField("atom:count")
+    updated = xmlmodels.XPathDateTimeField("atom:updated")
+
+
+class BenchFeed(xmlmodels.XmlModel):
+    class Meta:
+        app_label = "benchmarks"
+        namespaces = {
+            "atom": "http://www.w3.org/2005/Atom",
+        }
+
+    title = xmlmodels.XPathTextField("/atom:feed/atom:title")
+    titles = xmlmodels.XPathTextListField("/atom:feed/atom:entry/atom:title")
+    counts = xmlmodels.XPathIntegerListField("/atom:feed/atom:entry/atom:count")
+    counts_array = xmlmodels.XPathIntegerArrayField(
+        "/atom:feed/atom:entry/atom:count", text_nodes=True
+    )
+    updated = xmlmodels.XPathDateTimeListField("/atom:feed/atom:entry/atom:updated")
+    summaries_html = xmlmodels.XPathHtmlListField("/atom:feed/atom:entry/atom:summary/*")
+    summaries_inner_html = xmlmodels.XPathInnerHtmlListField(
+        "/atom:feed/atom:entry/atom:summary/*"
+    )
+    entries = xmlmodels.EmbeddedXPathListField(BenchEntry, "/atom:feed/atom:entry")
+
+    to_rss = xmlmodels.XsltField(xslt_string=ATOM2RSS_XSLT)
+    validate = xmlmodels.SchematronField(schematron_string=FEED_SCHEMATRON)
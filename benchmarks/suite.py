@@ -0,0 +1,191 @@
+"""
+Benchmark suite covering parsing, evaluation of each field type, XSLT
+fields and Schematron validation.
+
+Each benchmark is a function which receives a Document and returns the
+zero-argument callable to time, so that setup cost is excluded. Results
+are printed as a table and can be written as JSON to compare releases.
+
+Usage:
+
+    python -m benchmarks [--entries 100 1000] [--repeat 5] [-k PATTERN] [--json FILE]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+
+import django
+from lxml import etree
+
+import djxml
+
+from .documents import make_atom_feed
+from .models import BenchFeed
+
+BENCHMARKS = []
+
+
+def benchmark(group):
+    """
+    Register the decorated function as a benchmark in group.
+    """
+
+    def decorator(func):
+        BENCHMARKS.append((group, func.__name__, func))
+        return func
+
+    return decorator
+
+
+class Document(object):
+    def __init__(self, num_entries, seed=0):
+        self.num_entries = num_entries
+        self.source = make_atom_feed(num_entries, seed=seed)
+        self.root = BenchFeed.create_from_bytes(self.source).root
+
+
+@benchmark("parse")
+def create_from_bytes(doc):
+    return lambda: BenchFeed.create_from_bytes(doc.source)
+
+
+@benchmark("parse")
+def create_from_string(doc):
+    xml_source = doc.source.decode("utf-8")
+    return lambda: BenchFeed.create_from_string(xml_source)
+
+
+@benchmark("fields")
+def text_field(doc):
+    return lambda: BenchFeed(doc.root).title
+
+
+@benchmark("fields")
+def text_list_field(doc):
+    return lambda: BenchFeed(doc.root).titles
+
+
+@benchmark("fields")
+def integer_list_field(doc):
+    return lambda: BenchFeed(doc.root).counts
+
+
+@benchmark("fields")
+def integer_array_field(doc):
+    return lambda: BenchFeed(doc.root).counts_array
+
+
+@benchmark("fields")
+def datetime_list_field(doc):
+    return lambda: BenchFeed(doc.root).updated
+
+
+@benchmark("fields")
+def html_list_field(doc):
+    return lambda: BenchFeed(doc.root).summaries_html
+
+
+@benchmark("fields")
+def inner_html_list_field(doc):
+    return lambda: BenchFeed(doc.root).summaries_inner_html
+
+
+@benchmark("fields")
+def embedded_list_field(doc):
+    def run():
+        for entry in BenchFeed(doc.root).entries:
+            entry.title, entry.count, entry.updated
+
+    return run
+
+
+@benchmark("fields")
+def to_dict(doc):
+    return lambda: BenchFeed(doc.root).to_dict()
+
+
+@benchmark("fields")
+def xpath_method(doc):
+    return lambda: BenchFeed(doc.root).xpath("count(/atom:feed/atom:entry[atom:count > 100])")
+
+
+@benchmark("xslt")
+def xslt_field(doc):
+    return lambda: BenchFeed(doc.root).to_rss()
+
+
+@benchmark("xslt")
+def schematron_field(doc):
+    return lambda: BenchFeed(doc.root).validate()
+
+
+def time_callable(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def get_metadata():
+    return {
+        "djxml": djxml.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "django": django.get_version(),
+        "lxml": ".".join(str(v) for v in etree.LXML_VERSION),
+        "libxml2": ".".join(str(v) for v in etree.LIBXML_VERSION),
+        "libxslt": ".".join(str(v) for v in etree.LIBXSLT_VERSION),
+        "platform": platform.platform(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the django-xml benchmark suite.")
+    parser.add_argument(
+        "--entries",
+        type=int,
+        nargs="+",
+        default=[100, 1000],
+        help="Number of entries in the generated feed; may be given more than once",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "-k", dest="pattern", default=None, help="Only run benchmarks whose name contains this"
+    )
+    parser.add_argument("--json", dest="json_file", default=None, help="Write results here")
+    args = parser.parse_args(argv)
+
+    results = []
+    for num_entries in args.entries:
+        doc = Document(num_entries, seed=args.seed)
+        for group, name, func in BENCHMARKS:
+            if args.pattern and args.pattern not in name:
+                continue
+            result = {"group": group, "name": name, "entries": num_entries}
+            result.update(time_callable(func(doc), args.repeat))
+            results.append(result)
+            print(
+                "%-8s %-24s %7d entries %12.1f us (median %.1f us)"
+                % (group, name, num_entries, result["min"] * 1e6, result["median"] * 1e6)
+            )
+            sys.stdout.flush()
+
+    if args.json_file:
+        with open(args.json_file, "w") as f:
+            json.dump({"metadata": get_metadata(), "benchmarks": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
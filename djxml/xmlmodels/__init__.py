@@ -5,7 +5,12 @@ __all__ = (
     "get_xml_model",
     "register_xml_models",
     "signals",
+    "metrics",
+    "validation",
     "XmlModel",
+    "bind",
+    "ValueCache",
+    "FileValueStore",
     "lxml_extension",
     "XmlElementField",
     "XmlPrimaryElementField",
@@ -26,11 +31,14 @@ __all__ = (
     "XPathInnerHtmlListField",
     "XPathBooleanField",
     "XPathBooleanListField",
+    "XPathIntegerArrayField",
+    "XPathFloatArrayField",
     "SchematronField",
     "EmbeddedXPathField",
     "EmbeddedXPathListField",
     "EmbeddedXsltField",
     "EmbeddedSchematronField",
+    "XmlModelField",
 )
 
 from .loading import (
@@ -41,7 +49,10 @@ from .loading import (
     register_xml_models,
 )
 from . import signals
-from .base import XmlModel
+from . import metrics
+from . import validation
+from .base import XmlModel, bind
+from .cache import ValueCache, FileValueStore
 from .decorators import lxml_extension
 from .fields import (
     XmlElementField,
@@ -63,9 +74,12 @@ from .fields import (
     XPathInnerHtmlListField,
     XPathBooleanField,
     XPathBooleanListField,
+    XPathIntegerArrayField,
+    XPathFloatArrayField,
     SchematronField,
     EmbeddedXPathField,
     EmbeddedXPathListField,
     EmbeddedXsltField,
     EmbeddedSchematronField,
 )
+from .dbfields import XmlModelField
@@ -0,0 +1,157 @@
+"""
+A process-wide cache of compiled schemas, shared by every model and field
+which uses the same schema: the lxml.etree.XMLSchema of Meta.xsd_schema_file
+and the validator stylesheets that isoschematron generates for
+SchematronFields.
+
+Schemas read from files are keyed by their absolute path, modification
+time and size, and schemas given as strings by a digest of the string, so
+an edited file is compiled again.
+
+If settings.DJXML_SCHEMATRON_CACHE_DIR is set, generated validator
+stylesheets are also written to that directory and read from it by later
+processes, which then skip the Schematron compilation steps.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+
+from lxml import etree, isoschematron
+
+from .exceptions import UnstableReprException
+from .fields.base import stable_repr
+
+__all__ = ("cache", "get_xml_schema", "get_schematron_xslt")
+
+
+class ArtifactCache(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.artifacts = {}
+
+    def __len__(self):
+        return len(self.artifacts)
+
+    def get(self, key, build):
+        """
+        Return the artifact cached under key, calling build() to create it
+        if it isn't cached.
+        """
+        with self.lock:
+            artifact = self.artifacts.get(key)
+        if artifact is None:
+            # Built outside the lock, as compiling can take a while; if two
+            # threads race, the first artifact stored wins
+            artifact = build()
+            with self.lock:
+                artifact = self.artifacts.setdefault(key, artifact)
+        return artifact
+
+    def clear(self):
+        with self.lock:
+            self.artifacts.clear()
+
+
+cache = ArtifactCache()
+
+
+def source_key(source_file=None, source_string=None):
+    """
+    The part of a cache key which identifies a schema's source.
+    """
+    if source_file is not None:
+        path = os.path.abspath(source_file)
+        stat = os.stat(path)
+        return ("file", path, stat.st_mtime_ns, stat.st_size)
+    if isinstance(source_string, str):
+        source_string = source_string.encode("utf-8")
+    return ("string", hashlib.sha1(source_string).hexdigest())
+
+
+def get_xml_schema(xsd_schema_file):
+    """
+    Return the lxml.etree.XMLSchema of the xml schema file at xsd_schema_file.
+    """
+
+    def build():
+        return etree.XMLSchema(etree.parse(xsd_schema_file))
+
+    return cache.get(("xsd",) + source_key(source_file=xsd_schema_file), build)
+
+
+def get_cache_dir():
+    from django.conf import settings
+
+    if not settings.configured:
+        return None
+    return getattr(settings, "DJXML_SCHEMATRON_CACHE_DIR", None)
+
+
+def get_schematron_xslt(
+    parse, schematron_kwargs, parser_opts, source_file=None, source_string=None
+):
+    """
+    Return the root of the validator stylesheet generated by
+    isoschematron.Schematron from a Schematron schema.
+
+    parse:             A callable returning the parsed schema
+    schematron_kwargs: The keyword arguments for isoschematron.Schematron
+    parser_opts:       The options of the parser the schema is parsed with
+    source_file, source_string: The source of the schema, one of which must
+                                be given
+    """
+    try:
+        key = (
+            "schematron",
+            source_key(source_file, source_string),
+            stable_repr(schematron_kwargs),
+            stable_repr(parser_opts),
+        )
+    except UnstableReprException:
+        # The options can't be told apart from others, so the stylesheet
+        # isn't shared
+        return compile_schematron(parse(), schematron_kwargs)
+
+    def build():
+        cache_dir = get_cache_dir()
+        if cache_dir is None:
+            return compile_schematron(parse(), schematron_kwargs)
+        path = get_persisted_path(cache_dir, key)
+        if os.path.exists(path):
+            return etree.parse(path).getroot()
+        xslt_root = compile_schematron(parse(), schematron_kwargs)
+        persist(cache_dir, path, xslt_root)
+        return xslt_root
+
+    return cache.get(key, build)
+
+
+def compile_schematron(schematron_tree, schematron_kwargs):
+    schematron = isoschematron.Schematron(schematron_tree, **schematron_kwargs)
+    return schematron.validator_xslt.getroot()
+
+
+def get_persisted_path(cache_dir, key):
+    # The generated stylesheet also depends on the versions of lxml and of
+    # libxslt, which runs the compilation steps
+    versions = (etree.LXML_VERSION, etree.LIBXML_VERSION, etree.LIBXSLT_VERSION)
+    digest = hashlib.sha1(stable_repr((key, versions)).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, "schematron-%s.xsl" % digest)
+
+
+def persist(cache_dir, path, xslt_root):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first, so that other processes never read
+    # a partially written stylesheet
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                etree.tostring(xslt_root.getroottree(), xml_declaration=True, encoding="utf-8")
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -1,8 +1,13 @@
+import asyncio
+import collections
+import itertools
+import os
 import re
 import sys
-import codecs
 import functools
 import copy
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import import_module
 
 from lxml import etree
 
@@ -14,10 +19,31 @@ from django.core.exceptions import (
 from django.db.models.base import subclass_exception
 from django.utils.encoding import smart_str
 
+from .cache import NOT_CACHED
+from .decorators import current_instance
 from .signals import xmlclass_prepared
+from .validation import schema_errors
 from .options import Options, DEFAULT_NAMES
 from .loading import register_xml_models, get_xml_model
 
+#: Number of chunks of sources per worker process that extract_many() sends
+#: ahead of the results being consumed
+EXTRACT_CHUNKS_PER_WORKER = 2
+
+#: Size of the chunks of a file fed to the parser by iter_from_file()
+PULL_FEED_SIZE = 64 * 1024
+
+#: The instance attributes of models with Meta.compact. Field values are
+#: kept in the _field_values list, at the field's value_index
+COMPACT_SLOTS = (
+    "_field_values",
+    "_field_inits",
+    "_cached_values",
+    "_deferred_root",
+    "_prefix_nodes",
+    "__weakref__",
+)
+
 
 class XmlModelBase(type):
     """
@@ -36,9 +62,35 @@ class XmlModelBase(type):
         classcell = attrs.pop("__classcell__", None)
         if classcell is not None:
             new_attrs["__classcell__"] = classcell
+        attr_meta = attrs.pop("Meta", None)
+
+        # Instances of compact models have no __dict__ (unless they inherit
+        # one from a model which isn't compact); the slots are only declared
+        # once, by the first compact model in the hierarchy
+        compact_parents = [
+            b for b in parents if getattr(getattr(b, "_meta", None), "compact", False)
+        ]
+        compact = getattr(attr_meta, "compact", None)
+        if compact is None:
+            compact = bool(compact_parents)
+        elif not compact and compact_parents:
+            # The slots of the parent would hide the class defaults of the
+            # attributes which only compact instances set
+            raise TypeError(
+                "'class Meta' got attribute 'compact' of False, but %s inherits from the "
+                "compact model %s" % (name, compact_parents[0].__name__)
+            )
+        if compact and compact_parents:
+            new_attrs["__slots__"] = ()
+        elif compact:
+            new_attrs["__slots__"] = tuple(
+                slot
+                for slot in COMPACT_SLOTS
+                if not (slot == "__weakref__" and any(b.__weakrefoffset__ for b in bases))
+            )
+
         new_class = super().__new__(cls, name, bases, new_attrs)
 
-        attr_meta = attrs.pop("Meta", None)
         if not attr_meta:
             meta = getattr(new_class, "Meta", None)
         else:
@@ -147,7 +199,35 @@ class XmlModelBase(type):
 
 
 class XmlModel(metaclass=XmlModelBase):
+    # Subclasses have an instance __dict__ unless they set Meta.compact
+    __slots__ = ()
+
+    #: The CacheEntry of field values shared with other instances created
+    #: from the same document, if the model has a Meta.value_cache
+    _cached_values = None
+
+    #: A callable returning the root element, for instances whose document
+    #: is only parsed once a field which isn't cached is accessed
+    _deferred_root = None
+
+    #: The nodes selected by the XPath prefixes shared by the model's fields
+    #: (see djxml.xmlmodels.planner), evaluated on first use
+    _prefix_nodes = None
+
     def __init__(self, root_element_tree):
+        if self._meta.compact:
+            self._init_compact()
+        self._init_fields(root_element_tree)
+        super().__init__()
+
+    def _init_compact(self, load_root=None, cached_values=None):
+        self._field_values = [NOT_CACHED] * len(self._meta.local_fields)
+        self._field_inits = 0
+        self._cached_values = cached_values
+        self._deferred_root = load_root
+        self._prefix_nodes = None
+
+    def _init_fields(self, root_element_tree):
         fields_iter = iter(self._meta.fields)
 
         for field in fields_iter:
@@ -157,46 +237,60 @@ class XmlModel(metaclass=XmlModelBase):
                 val = None
             setattr(self, field.attname, val)
 
-        super().__init__()
+    @classmethod
+    def _create_deferred(cls, load_root, cached_values):
+        """
+        Return an instance backed by cached_values which calls load_root()
+        to parse its document only when the tree is needed.
+        """
+        instance = cls.__new__(cls)
+        if cls._meta.compact:
+            instance._init_compact(load_root, cached_values)
+        else:
+            instance._cached_values = cached_values
+            instance._deferred_root = load_root
+        return instance
+
+    def _load_deferred_root(self):
+        load_root, self._deferred_root = self._deferred_root, None
+        self._init_fields(load_root())
 
     def _get_etree_val(self, meta=None):
         if not meta:
             meta = self._meta
+        if self._deferred_root is not None:
+            self._load_deferred_root()
         return getattr(self, meta.etree.attname)
 
-    _default_xpath_eval = None
-
     @property
     def default_xpath_eval(self):
-        if self._default_xpath_eval is None:
-            self._default_xpath_eval = self._get_xpath_eval()
-        return self._default_xpath_eval
-
-    def _merge_xpath_kwargs(self, ns=None, ext=None):
         """
-        Merge user-provided namespace and extension keywords with the model
-        defaults.
+        A callable evaluating XPath queries on the instance with the model's
+        namespaces and extensions; the same as xpath().
         """
-        opts = self._meta
-
-        xpath_kwargs = {
-            "namespaces": getattr(opts, "namespaces", {}),
-            "extensions": {
-                k: functools.partial(method, self) for k, method in opts.extensions.items()
-            },
-        }
-
-        if ns is not None:
-            xpath_kwargs["namespaces"].update(ns)
-        if ext is not None:
-            xpath_kwargs["extensions"].update(ext)
-        return xpath_kwargs
+        return self.xpath
 
     def _get_xpath_eval(self, namespaces=None, extensions=None):
-        xpath_kwargs = self._merge_xpath_kwargs(ns=namespaces, ext=extensions)
-        return etree.XPathEvaluator(self._get_etree_val(), **xpath_kwargs)
+        """
+        Return an lxml.etree.XPathEvaluator of the instance's tree with the
+        model's namespaces and extension functions, plus any extra ones.
+
+        The model's extensions dispatch to the instance set in
+        decorators.current_instance, so the evaluator must be called with
+        it set (see xpath()).
+        """
+        opts = self._meta
+        all_namespaces = dict(opts.namespaces)
+        if namespaces is not None:
+            all_namespaces.update(namespaces)
+        all_extensions = dict(opts.extension_functions)
+        if extensions is not None:
+            all_extensions.update(extensions)
+        return etree.XPathEvaluator(
+            self._get_etree_val(), namespaces=all_namespaces, extensions=all_extensions
+        )
 
-    def xpath(self, query, namespaces=None, extensions=None):
+    def xpath(self, query, namespaces=None, extensions=None, **variables):
         """
         Evaluate and return the results of an XPath query expression on the
         xml model.
@@ -206,31 +300,276 @@ class XmlModel(metaclass=XmlModelBase):
                     pass to lxml.etree.XPathEvaluator()
         extensions: (optional) Extra extensions to pass on to
                     lxml.etree.XPathEvaluator()
+
+        Other keyword arguments are the values of XPath variables used in
+        query, e.g. xpath("//entry[@id = $id]", id="1").
         """
-        if namespaces is None and extensions is None:
-            xpath_eval = self.default_xpath_eval
-        else:
-            xpath_eval = self._get_xpath_eval(ns=namespaces, ext=extensions)
-        return xpath_eval(query)
+        tree = self._get_etree_val()
+        token = current_instance.set(self)
+        try:
+            if namespaces is None and extensions is None:
+                return self._meta.get_compiled_query(query)(tree, **variables)
+            return self._get_xpath_eval(namespaces, extensions)(query, **variables)
+        finally:
+            current_instance.reset(token)
+
+    def values(self, *field_names):
+        """
+        Return a dict of the values of the named fields. Only these fields
+        are evaluated and cleaned; the others are left untouched.
+        """
+        return {name: getattr(self, name) for name in field_names}
+
+    def to_dict(self):
+        """
+        Return a dict of the values of all XPath fields on the model. Each
+        field's query is compiled with the model class, so evaluating them
+        only binds this instance's tree.
+        """
+        return self.values(*[f.name for f in self._meta.fields if hasattr(f, "compile_xpath")])
 
     @classmethod
     def create_from_string(cls, xml_source, parser=None):
+        if isinstance(xml_source, bytes):
+            return cls.create_from_bytes(xml_source, parser=parser)
+        opts = cls._meta
+        if opts.value_cache is not None and parser is None:
+            return cls._create_deferred(
+                functools.partial(cls._parse_string, xml_source),
+                opts.value_cache.get_entry(cls, xml_source.encode("utf-8")),
+            )
+        return cls(cls._parse_string(xml_source, parser))
+
+    @classmethod
+    def _parse_string(cls, xml_source, parser=None):
         opts = cls._meta
-        if parser is None:
-            parser = opts.get_parser()
         # lxml doesn't like it when the <?xml ?> header has an encoding,
         # so we strip out encoding="utf-8" with a regex
         xml_source = re.sub(
             r'(<\?xml[^\?]*?) encoding="(?:utf-8|UTF-8)"([^\?]*?\?>)', r"\1\2", xml_source
         )
-        tree = etree.XML(xml_source, parser)
-        return cls(tree)
+        with schema_errors():
+            root = etree.XML(xml_source, parser or opts.get_document_parser())
+        if parser is None:
+            opts.set_parsed_root(root)
+        return root
+
+    @classmethod
+    def create_from_bytes(cls, xml_bytes, parser=None):
+        """
+        Parse an undecoded xml document. The bytes are handed to libxml2
+        as-is, which decodes them according to the xml declaration.
+
+        If the model has a Meta.value_cache, the returned instance only
+        parses the document when a field which isn't cached is accessed.
+        """
+        opts = cls._meta
+        if opts.value_cache is not None and parser is None:
+            return cls._create_deferred(
+                functools.partial(cls._parse_bytes, xml_bytes),
+                opts.value_cache.get_entry(cls, xml_bytes),
+            )
+        return cls(cls._parse_bytes(xml_bytes, parser))
+
+    @classmethod
+    def _parse_bytes(cls, xml_bytes, parser=None):
+        opts = cls._meta
+        with schema_errors():
+            root = etree.fromstring(xml_bytes, parser or opts.get_document_parser())
+        if parser is None:
+            opts.set_parsed_root(root)
+        return root
+
+    @classmethod
+    def create_from_fileobj(cls, fileobj, parser=None):
+        """
+        Parse an xml document from a file-like object opened in binary mode
+        (or from a path), without first reading it into a string.
+        """
+        return cls(cls._parse_file(fileobj, parser))
+
+    @classmethod
+    def create_from_file(cls, xml_file, parser=None):
+        """
+        Parse the xml file at the path xml_file.
+
+        If the model has a Meta.file_value_store, the returned instance only
+        parses the file when a field which isn't stored for the file's
+        current size and modification time is accessed.
+        """
+        opts = cls._meta
+        if opts.file_value_store is not None and parser is None:
+            return cls._create_deferred(
+                functools.partial(cls._parse_file, xml_file),
+                opts.file_value_store.get_entry(cls, xml_file),
+            )
+        return cls(cls._parse_file(xml_file, parser))
+
+    @classmethod
+    def _parse_file(cls, xml_file, parser=None):
+        opts = cls._meta
+        with schema_errors():
+            root = etree.parse(xml_file, parser or opts.get_document_parser()).getroot()
+        if parser is None:
+            opts.set_parsed_root(root)
+        return root
+
+    @classmethod
+    def extract_many(cls, sources, fields=None, workers=None, chunksize=64):
+        """
+        Evaluate fields on many documents in parallel worker processes.
+
+        sources:   An iterable of file paths or bytes objects
+        fields:    (optional) Names of the fields to evaluate. Defaults to
+                   the fields of the model whose values are plain python
+                   values, such as text, numbers and dates.
+        workers:   (optional) Number of worker processes, passed to
+                   concurrent.futures.ProcessPoolExecutor
+        chunksize: (optional) Number of sources sent to a worker at a time
+
+        Returns an iterator over a dict of {field name: value} per source, in
+        the order of sources. sources is read as the results are consumed,
+        with at most EXTRACT_CHUNKS_PER_WORKER chunks per worker in flight,
+        so that a long iterator of sources isn't held in memory. The model
+        class is imported by its dotted path in each worker, so it must be
+        importable at module level, and the values of the requested fields
+        must be picklable.
+        """
+        if fields is None:
+            fields = [f.name for f in cls._meta.fields if f.plain_value]
+        model_path = "%s.%s" % (cls.__module__, cls.__name__)
+        extract = functools.partial(extract_fields, model_path, tuple(fields))
+        max_pending = (workers or os.cpu_count() or 1) * EXTRACT_CHUNKS_PER_WORKER
+        sources = iter(sources)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = collections.deque()
+            while True:
+                chunk = list(itertools.islice(sources, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(extract, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    @classmethod
+    def iter_from_file(cls, xml_file, tag):
+        """
+        Incrementally parse xml_file (a path or file object), yielding an
+        instance of the model for each element matching tag as soon as the
+        element has been parsed.
+
+        tag may use a prefix from Meta.namespaces (e.g. "atom:entry").
+        Once the consumer moves on to the next instance, the previous
+        element and its preceding siblings are removed from the tree, so
+        memory use is bounded by the size of a single record. Field values
+        should therefore be read before advancing the iterator.
+
+        With Meta.validation of PARSE or sampled(rate), the document is
+        validated against the schema while it is parsed, and an invalid
+        document raises XmlSchemaValidationError once it has been read to
+        the end, after the instances parsed before.
+        """
+        opts = cls._meta
+        parser = opts.create_pull_parser(tag, schema=opts.get_parse_schema())
+        if hasattr(xml_file, "read"):
+            yield from cls._iter_pull_parser(parser, xml_file)
+        else:
+            with open(xml_file, "rb") as f:
+                yield from cls._iter_pull_parser(parser, f)
+
+    @classmethod
+    def _iter_pull_parser(cls, parser, f):
+        # Unlike iterparse(), XMLPullParser accepts all the options of
+        # XMLParser, as the model's other parsers do
+        while True:
+            data = f.read(PULL_FEED_SIZE)
+            if not data:
+                break
+            with schema_errors():
+                parser.feed(data)
+            yield from cls._read_pull_events(parser)
+        with schema_errors():
+            parser.close()
+        yield from cls._read_pull_events(parser)
+
+    @classmethod
+    def _read_pull_events(cls, parser):
+        opts = cls._meta
+        for event, element in parser.read_events():
+            opts.set_parsed_root(element)
+            yield cls(element)
+            release_element(element)
+
+    @classmethod
+    def push_parser(cls, tag):
+        """
+        Return a PushParser, to which a document can be fed in chunks as it
+        arrives, and which returns an instance of the model for each element
+        matching tag as soon as the element has been parsed.
+
+        tag may use a prefix from Meta.namespaces (e.g. "atom:entry"). As
+        with iter_from_file(), elements are released once the next chunk
+        is fed, so field values should be read before feeding it.
+        """
+        return PushParser(cls, tag)
+
+    @classmethod
+    async def _run_in_executor(cls, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls._meta.executor, func, *args)
+
+    @classmethod
+    async def acreate_from_string(cls, xml_source, parser=None):
+        """
+        Coroutine version of create_from_string(), which parses in the
+        model's Meta.executor so as not to block the event loop.
+        """
+        return await cls._run_in_executor(cls.create_from_string, xml_source, parser)
+
+    @classmethod
+    async def acreate_from_bytes(cls, xml_bytes, parser=None):
+        """
+        Coroutine version of create_from_bytes().
+        """
+        return await cls._run_in_executor(cls.create_from_bytes, xml_bytes, parser)
+
+    @classmethod
+    async def acreate_from_file(cls, xml_file, parser=None):
+        """
+        Coroutine version of create_from_file().
+        """
+        return await cls._run_in_executor(cls.create_from_file, xml_file, parser)
+
+    async def aget(self, name):
+        """
+        Return the value of the field called name, evaluating it in the
+        model's Meta.executor if it hasn't been evaluated yet.
+        """
+        return await self._run_in_executor(getattr, self, name)
 
     @classmethod
-    def create_from_file(cls, xml_file):
-        with codecs.open(xml_file, encoding="utf-8", mode="r") as f:
-            xml_source = f.read()
-        return cls.create_from_string(xml_source)
+    async def aiter_from_file(cls, xml_file, tag):
+        """
+        Asynchronous iterator version of iter_from_file().
+
+        The file is parsed in a thread of its own, one record at a time: the
+        next element is only parsed (and the previous one released) once
+        the consumer asks for it.
+        """
+        loop = asyncio.get_running_loop()
+        instances = cls.iter_from_file(xml_file, tag)
+        # The incremental parser is tied to the thread which created it
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            try:
+                while True:
+                    instance = await loop.run_in_executor(executor, next, instances, None)
+                    if instance is None:
+                        break
+                    yield instance
+            finally:
+                await loop.run_in_executor(executor, instances.close)
 
     def __repr__(self):
         try:
@@ -252,3 +591,123 @@ class XmlModel(metaclass=XmlModelBase):
 
     def __hash__(self):
         return hash(self._get_etree_val())
+
+
+class PushParser(object):
+    """
+    An incremental parser of a document fed in chunks, created with
+    XmlModel.push_parser(). feed() and close() return a list of instances
+    of the model, one for each element matching the tag which was closed
+    by the data they parsed.
+    """
+
+    def __init__(self, model, tag):
+        self.model = model
+        opts = model._meta
+        self.parser = opts.create_pull_parser(tag, schema=opts.get_parse_schema())
+        # The elements of the instances returned by the last call, which are
+        # released on the next one
+        self.consumed = []
+
+    def feed(self, data):
+        """
+        Parse the next chunk of the document, bytes or a string.
+        """
+        self.release()
+        with schema_errors():
+            self.parser.feed(data)
+        return self.read_instances()
+
+    def close(self):
+        """
+        Finish parsing the document, raising lxml.etree.XMLSyntaxError if it
+        is incomplete, or XmlSchemaValidationError if it was validated while
+        parsed (see Meta.validation) and is invalid.
+        """
+        self.release()
+        with schema_errors():
+            self.parser.close()
+        return self.read_instances()
+
+    def read_instances(self):
+        instances = []
+        opts = self.model._meta
+        for event, element in self.parser.read_events():
+            opts.set_parsed_root(element)
+            instances.append(self.model(element))
+            self.consumed.append(element)
+        return instances
+
+    def release(self):
+        for element in self.consumed:
+            release_element(element)
+        self.consumed = []
+
+
+def bind(source, *models):
+    """
+    Return a tuple with an instance of each of models wrapping the same
+    root element, so that a document read by several models is only parsed
+    once.
+
+    source may be an lxml element or element tree, or an xml document as
+    bytes or a string, which is parsed as models[0].create_from_bytes() or
+    create_from_string() would parse it. Each instance is then created as
+    Model(root) creates one. Instances of models with the same namespaces
+    also share the nodes selected by their XPath fields' shared prefixes
+    (see djxml.xmlmodels.planner), so a prefix used by several of the
+    models is only evaluated once.
+    """
+    if not models:
+        raise TypeError("bind() requires at least one xml model")
+    first = models[0]
+    if isinstance(source, etree._Element):
+        root = source
+    elif isinstance(source, etree._ElementTree):
+        root = source.getroot()
+    elif isinstance(source, bytes):
+        root = first._parse_bytes(source)
+    else:
+        root = first._parse_string(source)
+
+    instances = []
+    prefix_nodes = {}
+    for model in models:
+        instance = model(root)
+        namespaces = tuple(sorted(model._meta.namespaces.items()))
+        instance._prefix_nodes = prefix_nodes.setdefault(namespaces, {})
+        instances.append(instance)
+    return tuple(instances)
+
+
+def extract_fields(model_path, field_names, sources):
+    """
+    Worker function for XmlModel.extract_many(): parse each of sources with
+    the model at the dotted path model_path and return a list of the values
+    of field_names.
+    """
+    module_name, class_name = model_path.rsplit(".", 1)
+    model = getattr(import_module(module_name), class_name)
+    results = []
+    for source in sources:
+        if isinstance(source, bytes):
+            instance = model.create_from_bytes(source)
+        else:
+            instance = model.create_from_file(source)
+        results.append(instance.values(*field_names))
+    return results
+
+
+def release_element(element):
+    """
+    Free an element which has been fully consumed during incremental parsing,
+    along with the siblings that preceded it and those of its ancestors.
+    """
+    element.clear()
+    node, parent = element, element.getparent()
+    while parent is not None:
+        while node.getprevious() is not None:
+            del parent[0]
+        node, parent = parent, parent.getparent()
+    if element.getparent() is not None:
+        element.getparent().remove(element)
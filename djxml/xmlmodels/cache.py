@@ -0,0 +1,257 @@
+"""
+Caches of evaluated field values, shared between instances of an xml model
+created from the same document: ValueCache in memory, keyed by the
+document's content, and FileValueStore on disk, keyed by file path and
+modification time.
+
+Only fields with plain python values (see XmlField.plain_value) are cached,
+since other values (elements, embedded models) reference the parsed tree.
+Cached values are shared by every instance served from the same entry and
+should be treated as read-only.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+__all__ = ("ValueCache", "FileValueStore", "NOT_CACHED")
+
+
+class NOT_CACHED:
+    pass
+
+
+#: Approximate fixed cost of an entry in the cache: its key, dicts and
+#: bookkeeping objects
+ENTRY_OVERHEAD = 512
+
+
+def estimate_size(value):
+    """
+    Approximate number of bytes of memory used by a cached value.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(estimate_size(v) for v in value)
+    elif isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return size
+
+
+class CacheEntry(object):
+    """
+    The cached field values of one document for one model. Passed to the
+    instances created from the document, which read values with get() and
+    store newly evaluated ones with set().
+    """
+
+    __slots__ = ("cache", "key", "values", "size")
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self.values = {}
+        self.size = ENTRY_OVERHEAD
+
+    def get(self, name):
+        return self.values.get(name, NOT_CACHED)
+
+    def set(self, name, value):
+        self.cache.set_value(self, name, value)
+
+
+class ValueCache(object):
+    """
+    An in-memory LRU cache of field values, keyed by a digest of the source
+    document and the model's class and field definitions.
+
+    Set as the `value_cache` attribute of an XmlModel's Meta class to have
+    create_from_string() and create_from_bytes() return instances which only
+    parse the document if a field which isn't cached is accessed.
+
+    max_bytes: The approximate maximum amount of memory used by cached
+               values. The least recently used documents are evicted first.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def make_key(self, model, xml_bytes):
+        opts = model._meta
+        digest = hashlib.blake2b(xml_bytes, digest_size=20).digest()
+        return (model.__module__, model.__qualname__, opts.definition_digest, digest)
+
+    def get_entry(self, model, xml_bytes):
+        """
+        Return the CacheEntry for the document xml_bytes parsed as model,
+        creating an empty one if it isn't in the cache.
+        """
+        key = self.make_key(model, xml_bytes)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+            entry = self.entries[key] = CacheEntry(self, key)
+            self.bytes_used += entry.size
+            self.evict()
+            return entry
+
+    def set_value(self, entry, name, value):
+        size = estimate_size(name) + estimate_size(value)
+        with self.lock:
+            if name in entry.values:
+                return
+            entry.values[name] = value
+            entry.size += size
+            if self.entries.get(entry.key) is entry:
+                self.bytes_used += size
+                self.entries.move_to_end(entry.key)
+                self.evict()
+
+    def evict(self):
+        while self.bytes_used > self.max_bytes and self.entries:
+            key, entry = self.entries.popitem(last=False)
+            self.bytes_used -= entry.size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes_used = 0
+
+
+class FileValues(object):
+    """
+    The stored field values of one file for one model. Values are only
+    returned if the file's size and mtime and the field's definition are
+    the same as when they were stored.
+    """
+
+    __slots__ = ("store", "model", "path", "size", "mtime_ns", "values")
+
+    def __init__(self, store, model, path, size, mtime_ns):
+        self.store = store
+        self.model = model
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.values = store.load_values(model, path, size, mtime_ns)
+
+    def get(self, name):
+        return self.values.get(name, NOT_CACHED)
+
+    def set(self, name, value):
+        self.values[name] = value
+        if self.model._meta.field_digests.get(name) is not None:
+            self.store.save_value(self.model, self.path, self.size, self.mtime_ns, name, value)
+
+
+class FileValueStore(object):
+    """
+    A persistent store of field values of xml files, in an SQLite database.
+
+    Values are stored per (file path, size, mtime, model, field definition)
+    so that a change to a file, or to the definition of a field, makes the
+    stored value stale. Set as the `file_value_store` attribute of an
+    XmlModel's Meta class to have create_from_file() return instances which
+    only parse files which changed, or whose requested fields changed.
+
+    Values are pickled, so the database should only be writable by trusted
+    users. Fields whose definition can't be told apart from another in a
+    later process aren't stored: those with options such as an lxml
+    parser, whose only representation is their memory address (see
+    Options.get_field_digest()). Stored values are also stale once djxml
+    is upgraded.
+
+    db_path: The path of the SQLite database file, created if necessary
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.local = threading.local()
+
+    def get_connection(self):
+        # sqlite3 connections can't be shared between threads
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = self.local.connection = sqlite3.connect(self.db_path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS djxml_field_values ("
+                " path TEXT NOT NULL,"
+                " model TEXT NOT NULL,"
+                " field TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " definition TEXT NOT NULL,"
+                " value BLOB NOT NULL,"
+                " PRIMARY KEY (path, model, field))"
+            )
+        return connection
+
+    def get_model_label(self, model):
+        return "%s.%s" % (model.__module__, model.__qualname__)
+
+    def get_entry(self, model, path):
+        """
+        Return the FileValues of the file at path for model.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        return FileValues(self, model, path, stat.st_size, stat.st_mtime_ns)
+
+    def load_values(self, model, path, size, mtime_ns):
+        field_digests = model._meta.field_digests
+        rows = self.get_connection().execute(
+            "SELECT field, definition, value FROM djxml_field_values"
+            " WHERE path = ? AND model = ? AND size = ? AND mtime_ns = ?",
+            (path, self.get_model_label(model), size, mtime_ns),
+        )
+        return {
+            name: pickle.loads(value)
+            for name, definition, value in rows
+            if field_digests.get(name) == definition
+        }
+
+    def save_value(self, model, path, size, mtime_ns, name, value):
+        connection = self.get_connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO djxml_field_values"
+                " (path, model, field, size, mtime_ns, definition, value)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    path,
+                    self.get_model_label(model),
+                    name,
+                    size,
+                    mtime_ns,
+                    model._meta.field_digests[name],
+                    pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                ),
+            )
+
+    def close(self):
+        """
+        Close the current thread's connection to the database, if it has one.
+        """
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            self.local.connection = None
+            connection.close()
+
+    def clear(self):
+        connection = self.get_connection()
+        with connection:
+            connection.execute("DELETE FROM djxml_field_values")
@@ -0,0 +1,161 @@
+"""
+A field for django.db.models models which stores an xml document in a text
+column and reads it as an instance of an XmlModel.
+"""
+
+from lxml import etree
+
+import django
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from .base import XmlModel
+
+__all__ = ("XmlModelField",)
+
+
+class XmlModelDescriptor(DeferredAttribute):
+    """
+    Keeps the raw document loaded from the database in the row's __dict__,
+    and only parses it the first time the attribute is read. The parsed
+    instance is memoized on the row until another document is assigned.
+    """
+
+    def __init__(self, field):
+        # DeferredAttribute is created with the field from Django 3.0, and
+        # with its attname before
+        super().__init__(field if django.VERSION >= (3, 0) else field.attname)
+        self.field = field
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if value is None or isinstance(value, XmlModel):
+            return value
+        cache_name = self.field.get_xml_cache_name()
+        cached = instance.__dict__.get(cache_name)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        xml_instance = self.field.xml_model.create_from_string(value)
+        instance.__dict__[cache_name] = (value, xml_instance)
+        return xml_instance
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class XmlModelField(models.TextField):
+    """
+    Stores an xml document in a text column. Reading the attribute returns
+    an instance of xml_model, parsed on first access and memoized on the
+    row; rows whose document is never read are never parsed. An instance
+    of xml_model, a string or bytes can be assigned.
+
+    xml_model:   The XmlModel class of the document
+    denormalize: (optional) A dict mapping the names of other fields of the
+                 model to names of fields of xml_model. When those fields
+                 are saved, the document is parsed (if it wasn't already)
+                 and the values of the xml_model fields are copied to them,
+                 so queries can filter on them without parsing any xml.
+                 save(update_fields=...) only saves them if they are
+                 listed. The pre_save() of those fields is replaced
+                 when the model class is prepared.
+    """
+
+    def __init__(self, xml_model, denormalize=None, **kwargs):
+        self.xml_model = xml_model
+        self.denormalize = denormalize or {}
+        super().__init__(**kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        args = [self.xml_model] + list(args)
+        if self.denormalize:
+            kwargs["denormalize"] = self.denormalize
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        # Rather than descriptor_class, which Django only uses from 3.0
+        setattr(cls, self.attname, XmlModelDescriptor(self))
+        if self.denormalize and not cls._meta.abstract:
+            models.signals.class_prepared.connect(self.denormalize_fields, sender=cls)
+
+    def denormalize_fields(self, sender, **kwargs):
+        """
+        Make the pre_save() of each of the fields named in denormalize set
+        the field's value from the document first. Unlike a pre_save signal
+        handler, pre_save() is also called by bulk_create().
+
+        The pre_save attribute of those field objects is overwritten, so a
+        copy of one made from its deconstruct() (e.g. by migrations, or for
+        a model built from them) doesn't denormalize.
+        """
+        for field_name, xml_field_name in self.denormalize.items():
+            field = sender._meta.get_field(field_name)
+            field.pre_save = DenormalizedPreSave(self, field, xml_field_name)
+
+    def get_xml_cache_name(self):
+        return "_%s_xml_cache" % self.name
+
+    def to_string(self, value):
+        """
+        Return value, an instance of xml_model, bytes or a string, as the
+        string stored in the database.
+        """
+        if isinstance(value, bytes):
+            # Decoded by libxml2, according to the xml declaration
+            value = self.xml_model.create_from_bytes(value)
+        if isinstance(value, XmlModel):
+            return etree.tounicode(value._get_etree_val().getroottree())
+        return value
+
+    def get_raw_value(self, model_instance):
+        """
+        Return the document of model_instance as a string, without parsing
+        it unless it was assigned as bytes.
+        """
+        value = model_instance.__dict__.get(self.attname)
+        if isinstance(value, bytes):
+            # Parsed through the descriptor, so that the instance is memoized
+            value = getattr(model_instance, self.attname)
+        return self.to_string(value)
+
+    def get_denormalized_value(self, model_instance, xml_field_name):
+        xml_instance = getattr(model_instance, self.attname)
+        if xml_instance is None:
+            return None
+        return getattr(xml_instance, xml_field_name)
+
+    def pre_save(self, model_instance, add):
+        return self.get_raw_value(model_instance)
+
+    def value_from_object(self, obj):
+        return self.get_raw_value(obj)
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, XmlModel)):
+            return self.to_string(value)
+        return super().to_python(value)
+
+    def get_prep_value(self, value):
+        return super().get_prep_value(self.to_string(value))
+
+
+class DenormalizedPreSave(object):
+    """
+    The pre_save() of a field whose value is denormalized from the document
+    of an XmlModelField.
+    """
+
+    def __init__(self, xml_field, field, xml_field_name):
+        self.xml_field = xml_field
+        self.field = field
+        self.xml_field_name = xml_field_name
+        self.pre_save = field.pre_save
+
+    def __call__(self, model_instance, add):
+        value = self.xml_field.get_denormalized_value(model_instance, self.xml_field_name)
+        setattr(model_instance, self.field.attname, value)
+        return self.pre_save(model_instance, add)
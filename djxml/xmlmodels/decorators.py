@@ -1,7 +1,16 @@
 from __future__ import absolute_import
+import contextvars
 import types
 import functools
 
+from . import metrics
+from .exceptions import ExtensionException
+
+#: The xml model instance whose fields are currently being evaluated. lxml
+#: extension functions are compiled once per model class, so they look up the
+#: instance to dispatch to here rather than being bound with functools.partial
+current_instance = contextvars.ContextVar("current_instance")
+
 
 def lxml_extension(method=None, ns_uri=None, name=None):
     """
@@ -85,3 +94,39 @@ def lxml_extension(method=None, ns_uri=None, name=None):
     wrapper.lxml_extension_name = name
 
     return wrapper
+
+
+def bind_extension(method, ns_uri=None, extension_name=None):
+    """
+    Wrap an @lxml_extension model method in a plain lxml extension function
+    which calls the method on the instance set in `current_instance`.
+
+    The returned function can be passed to lxml.etree.XPath() or
+    lxml.etree.XSLT() once per model class and reused for every instance.
+    ns_uri and extension_name are the names the extension is registered
+    under, used to label it in djxml.xmlmodels.metrics.
+    """
+    if extension_name is None:
+        extension_name = method.lxml_extension_name
+    metrics_name = "{%s}%s" % (ns_uri, extension_name) if ns_uri else extension_name
+
+    @functools.wraps(method)
+    def extension(context, *args):
+        try:
+            instance = current_instance.get()
+        except LookupError:
+            raise ExtensionException(
+                "Extension %r was called outside of the evaluation of an xml model"
+                % extension_name
+            )
+        if not metrics.enabled:
+            return method(instance, context, *args)
+        start = metrics.timer()
+        try:
+            return method(instance, context, *args)
+        finally:
+            metrics.registry.record_extension(
+                instance.__class__, metrics_name, metrics.timer() - start
+            )
+
+    return extension
@@ -2,6 +2,9 @@ import functools
 
 from lxml import etree
 
+from . import metrics, planner
+from .cache import NOT_CACHED
+from .decorators import current_instance
 from .exceptions import XsltException
 
 
@@ -12,24 +15,53 @@ class Creator(object):
 
     def __init__(self, field):
         self.field = field
+        self.cache_name = field.get_cache_name()
+        # Instances of models with Meta.compact keep field values in the
+        # _field_values list rather than in their __dict__
+        if field.model._meta.compact:
+            self.value_index = field.value_index
+        else:
+            self.value_index = None
 
     def __get__(self, model_instance, type=None):
-        return model_instance.__dict__[self.field.name]
+        if model_instance._deferred_root is not None:
+            model_instance._load_deferred_root()
+        if self.value_index is None:
+            return model_instance.__dict__[self.field.name]
+        value = model_instance._field_values[self.value_index]
+        return None if value is NOT_CACHED else value
 
     def __set__(self, model_instance, value):
         cleaned_value = self.field.clean(value, model_instance)
-        model_instance.__dict__[self.field.name] = cleaned_value
+        if self.value_index is None:
+            model_instance.__dict__[self.field.name] = cleaned_value
         if value is not None:
-            model_instance.__dict__[self.cache_name] = cleaned_value
+            self.set_cached(model_instance, cleaned_value)
+
+    def get_cached(self, model_instance):
+        """
+        Return the value of the field cached on model_instance, or NOT_CACHED
+        """
+        if self.value_index is None:
+            return model_instance.__dict__.get(self.cache_name, NOT_CACHED)
+        return model_instance._field_values[self.value_index]
+
+    def set_cached(self, model_instance, value):
+        if self.value_index is None:
+            model_instance.__dict__[self.cache_name] = value
+        else:
+            model_instance._field_values[self.value_index] = value
 
 
 class ImmutableCreator(Creator):
     def __init__(self, field):
         super().__init__(field)
         self.field.value_initialized = False
-        self.cache_name = field.get_cache_name()
 
     def __set__(self, model_instance, value):
+        if self.value_index is not None:
+            self.set_compact(model_instance, value)
+            return
         if "_field_inits" not in model_instance.__dict__:
             model_instance._field_inits = {}
         if model_instance._field_inits.get(self.field.name, False):
@@ -43,6 +75,20 @@ class ImmutableCreator(Creator):
             model_instance._field_inits[self.field.name] = True
             self.field.value_initialized = True
 
+    def set_compact(self, model_instance, value):
+        # _field_inits is a bitmask of the initialized fields' value_index
+        flag = 1 << self.value_index
+        if model_instance._field_inits & flag:
+            raise TypeError(
+                "%s.%s is immutable" % (model_instance.__class__.__name__, self.field.name)
+            )
+        cleaned_value = self.field.clean(value, model_instance)
+        if value is not None:
+            model_instance._field_values[self.value_index] = cleaned_value
+        if cleaned_value is not None:
+            model_instance._field_inits |= flag
+            self.field.value_initialized = True
+
 
 class FieldBase(type):
     """
@@ -74,69 +120,103 @@ class XPathObjectDescriptor(ImmutableCreator):
     def __get__(self, instance, instance_type=None):
         if instance is None:
             raise AttributeError("Can only be accessed via an instance.")
+        value = self.get_cached(instance)
+        if value is not NOT_CACHED:
+            return value
+        cached_values = instance._cached_values
+        if cached_values is not None and self.field.plain_value:
+            value = cached_values.get(self.field.name)
+            if value is not NOT_CACHED:
+                self.set_cached(instance, value)
+                return value
+
+        if metrics.enabled:
+            start = metrics.timer()
+
+        tree = instance._get_etree_val()
+
+        # The compiled query is shared by all instances of the model; only
+        # the tree and the instance its extensions dispatch to are bound
+        token = current_instance.set(instance)
         try:
-            return getattr(instance, self.cache_name)
-        except AttributeError:
-            tree = instance._get_etree_val()
-            query = self.field.xpath_query
+            if self.field.xpath_plan is not None:
+                result = planner.evaluate(self.field, instance, tree)
+            else:
+                result = self.field.compiled_xpath(tree)
+        finally:
+            current_instance.reset(token)
+        nodes = self.field.clean(result, instance)
+        self.set_cached(instance, nodes)
+        if cached_values is not None and self.field.plain_value:
+            cached_values.set(self.field.name, nodes)
+
+        if metrics.enabled:
+            metrics.registry.record_field(
+                instance.__class__,
+                self.field,
+                metrics.timer() - start,
+                metrics.result_count(result),
+            )
+        return nodes
 
-            namespaces = {}
-            namespaces.update(getattr(instance._meta, "namespaces", {}))
-            namespaces.update(getattr(self.field, "extra_namespaces", {}))
 
-            extensions = {
-                k: functools.partial(method, instance)
-                for k, method in instance._meta.extensions.items()
-            }
-            extensions.update(self.field.extensions)
+class XPathFieldBase(FieldBase):
+    descriptor_cls = XPathObjectDescriptor
 
-            xpath_eval = etree.XPathEvaluator(tree, namespaces=namespaces, extensions=extensions)
 
-            nodes = xpath_eval(query)
-            nodes = self.field.clean(nodes, instance)
-            setattr(instance, self.cache_name, nodes)
-            return nodes
+class XsltTransform(object):
+    """
+    The callable returned when accessing an XsltField on a model instance.
 
+    Applies the field's compiled stylesheet to the instance's tree, passing
+    keyword arguments as stylesheet parameters.
+    """
 
-class XPathFieldBase(FieldBase):
-    descriptor_cls = XPathObjectDescriptor
+    def __init__(self, field, instance):
+        self.field = field
+        self.instance = instance
 
+    def __call__(self, *args, **kwargs):
+        if metrics.enabled:
+            start = metrics.timer()
 
-class XsltObjectDescriptor(ImmutableCreator):
-    def __init__(self, field):
-        self.cache_name = field.get_cache_name()
-        super().__init__(field)
+        instance = self.instance
+        xslt_func = self.field.get_xslt(instance)
+        tree = instance._get_etree_val()
+        token = current_instance.set(instance)
+        try:
+            xslt_result = xslt_func(tree, *args, **kwargs)
+        except etree.XSLTApplyError as e:
+            raise XsltException(e, xslt_func)
+        finally:
+            current_instance.reset(token)
+        value = self.field.clean(xslt_result, instance)
+
+        if metrics.enabled:
+            metrics.registry.record_field(
+                instance.__class__, self.field, metrics.timer() - start, 1
+            )
+        return value
+
+    async def acall(self, *args, **kwargs):
+        """
+        Apply the stylesheet in the model's Meta.executor, without blocking
+        the event loop.
+        """
+        return await self.instance._run_in_executor(
+            functools.partial(self.__call__, *args, **kwargs)
+        )
 
+
+class XsltObjectDescriptor(ImmutableCreator):
     def __get__(self, instance, instance_type=None):
         if instance is None:
             raise AttributeError("Can only be accessed via an instance.")
-        try:
-            return getattr(instance, self.cache_name)
-        except AttributeError:
-            tree = instance._get_etree_val()
-            xslt_tree = self.field.get_xslt_tree(instance)
-
-            extensions = {
-                k: functools.partial(method, instance)
-                for k, method in instance._meta.extensions.items()
-            }
-            extensions.update(self.field.extensions)
-
-            transform = etree.XSLT(xslt_tree, extensions=extensions)
-
-            def xslt_wrapper(xslt_func):
-                def wrapper(*args, **kwargs):
-                    try:
-                        xslt_result = xslt_func(tree, *args, **kwargs)
-                    except etree.XSLTApplyError as e:
-                        # Put this in frame locals for debugging
-                        xslt_source = etree.tostring(xslt_tree, encoding="utf8")
-                        raise XsltException(e, xslt_func)
-                    return self.field.clean(xslt_result, instance)
-
-                return wrapper
-
-            return xslt_wrapper(transform)
+        transform = self.get_cached(instance)
+        if transform is NOT_CACHED:
+            transform = XsltTransform(self.field, instance)
+            self.set_cached(instance, transform)
+        return transform
 
 
 class XsltFieldBase(FieldBase):
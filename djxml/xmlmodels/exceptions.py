@@ -13,6 +13,10 @@ class XPathException(XmlModelException):
     pass
 
 
+class UnstableReprException(XmlModelException):
+    pass
+
+
 class XsltException(XmlModelException):
     def __init__(self, apply_exception, xslt_func):
         self.apply_exception = apply_exception
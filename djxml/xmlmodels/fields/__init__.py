@@ -13,6 +13,8 @@ from .xpath import (
     XPathFloatListField,
     XPathDateTimeListField,
     XPathBooleanListField,
+    XPathIntegerArrayField,
+    XPathFloatArrayField,
     XPathHtmlField,
     XPathHtmlListField,
     XPathInnerHtmlMixin,
@@ -46,6 +48,8 @@ __all__ = (
     "XPathFloatListField",
     "XPathDateTimeListField",
     "XPathBooleanListField",
+    "XPathIntegerArrayField",
+    "XPathFloatArrayField",
     "XPathHtmlField",
     "XPathHtmlListField",
     "XPathInnerHtmlMixin",
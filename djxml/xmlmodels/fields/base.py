@@ -1,4 +1,8 @@
 import copy
+import functools
+import hashlib
+import re
+import types
 from lxml import etree
 
 from django.core.exceptions import ValidationError
@@ -6,13 +10,40 @@ from django.core.exceptions import ValidationError
 from django.utils.encoding import force_str
 
 from ..descriptors import ImmutableFieldBase
-from ..exceptions import XmlSchemaValidationError
+from ..exceptions import UnstableReprException, XmlSchemaValidationError
+from ..validation import OFF, POST
 
 
 class NOT_PROVIDED:
     pass
 
 
+def stable_repr(value):
+    """
+    A repr() of value which doesn't include memory addresses, so that it is
+    the same in every process. Raises UnstableReprException for values
+    which have no such representation, such as lxml parsers.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, dict):
+        items = sorted((stable_repr(k), stable_repr(v)) for k, v in value.items())
+        return "{%s}" % ", ".join("%s: %s" % item for item in items)
+    if isinstance(value, (list, tuple)):
+        return "[%s]" % ", ".join(stable_repr(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return "{%s}" % ", ".join(sorted(stable_repr(v) for v in value))
+    if isinstance(value, functools.partial):
+        return "partial(%s)" % stable_repr((value.func, value.args, value.keywords))
+    if isinstance(value, types.MethodType):
+        return "method(%s)" % stable_repr((value.__self__, value.__func__))
+    if isinstance(value, re.Pattern):
+        return "re.compile(%r, %r)" % (value.pattern, value.flags)
+    if hasattr(value, "__qualname__"):
+        return "%s.%s" % (getattr(value, "__module__", None), value.__qualname__)
+    raise UnstableReprException("%r has no representation stable across processes" % value)
+
+
 class XmlField(object):
     # These track each time a Field instance is created. Used to retain order.
     creation_counter = 0
@@ -26,6 +57,22 @@ class XmlField(object):
     #: Used by immutable descriptors to
     value_initialized = False
 
+    #: True if the field's python value never references the xml tree (e.g.
+    #: text, numbers and dates), so it can be pickled and outlive the document
+    plain_value = False
+
+    #: Attributes set on the field at runtime which don't affect its value
+    non_definition_attrs = (
+        "name",
+        "attname",
+        "model",
+        "creation_counter",
+        "value_initialized",
+        "value_index",
+        "compiled_xpath",
+        "xpath_plan",
+    )
+
     def __init__(self, name=None, required=False, default=NOT_PROVIDED, parser=None):
         self.name = name
         self.required = required
@@ -91,6 +138,20 @@ class XmlField(object):
     def get_cache_name(self):
         return "_%s_cache" % self.name
 
+    def get_definition_digest(self):
+        """
+        Returns a hex digest of the field's class and options, which changes
+        whenever the definition of the field changes. Used to invalidate
+        cached values of the field. Raises UnstableReprException if an
+        option has no representation stable across processes.
+        """
+        items = ["%s.%s" % (self.__class__.__module__, self.__class__.__qualname__)]
+        for name, value in sorted(self.__dict__.items()):
+            if name.startswith("_") or name in self.non_definition_attrs:
+                continue
+            items.append("%s=%s" % (name, stable_repr(value)))
+        return hashlib.sha1("\n".join(items).encode("utf-8")).hexdigest()
+
     def has_default(self):
         """Returns a boolean of whether this field has a default value."""
         return self.default is not NOT_PROVIDED
@@ -139,11 +200,18 @@ class XmlPrimaryElementField(XmlElementField):
     is_root_field = True
 
     def validate(self, value, model_instance):
-        if model_instance._meta.xsd_schema is not None:
-            try:
-                model_instance._meta.xsd_schema.assertValid(value)
-            except Exception as e:
-                raise XmlSchemaValidationError(str(e))
+        opts = model_instance._meta
+        if opts.xsd_schema is None or opts.validation == OFF:
+            return
+        if opts.validation != POST:
+            # Documents parsed by the model were validated while parsed (or
+            # not, as sampled); other trees are validated here instead
+            if opts.pop_parsed_root(value) or opts.get_parse_schema() is None:
+                return
+        try:
+            opts.xsd_schema.assertValid(value)
+        except Exception as e:
+            raise XmlSchemaValidationError(str(e))
 
     def contribute_to_class(self, cls, name):
         assert not cls._meta.has_root_field, (
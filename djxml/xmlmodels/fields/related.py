@@ -1,3 +1,6 @@
+import weakref
+from collections.abc import Sequence
+
 from ..signals import xmlclass_prepared
 from ..loading import get_xml_model
 from .base import XmlField
@@ -99,6 +102,53 @@ class EmbeddedField(XmlField):
         cls._meta.add_field(self)
 
 
+class EmbeddedModelList(Sequence):
+    """
+    The value of an EmbeddedXPathListField: a read-only sequence of embedded
+    model instances, one per node, each created the first time it is
+    accessed.
+
+    Instances are kept in a weak cache, so accessing an index again returns
+    the same instance for as long as it is referenced elsewhere.
+    """
+
+    __slots__ = ("model", "nodes", "instances")
+
+    def __init__(self, model, nodes):
+        self.model = model
+        self.nodes = nodes
+        self.instances = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.nodes)))]
+        if index < 0:
+            index += len(self.nodes)
+            if index < 0:
+                raise IndexError("%s index out of range" % self.__class__.__name__)
+        instance = self.instances.get(index)
+        if instance is None:
+            instance = self.instances[index] = self.model(self.nodes[index])
+        return instance
+
+    def __iter__(self):
+        for i in range(len(self.nodes)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, (EmbeddedModelList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<%s: %d %s>" % (self.__class__.__name__, len(self), self.model.__name__)
+
+
 class EmbeddedXPathField(XPathSingleNodeField, EmbeddedField):
     def __init__(self, xml_model, *args, **kwargs):
         self.embedded_model = xml_model
@@ -125,7 +175,7 @@ class EmbeddedXPathListField(XPathListField, EmbeddedField):
         if value is None:
             return value
         else:
-            return [self.embedded_model(v) for v in value]
+            return EmbeddedModelList(self.embedded_model, value)
 
     def contribute_to_class(self, cls, name):
         EmbeddedField.contribute_to_class(self, cls, name)
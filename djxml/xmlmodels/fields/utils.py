@@ -1,11 +1,57 @@
 from __future__ import absolute_import
+import email.utils
+from datetime import datetime
+
 import dateutil.parser
 
 from ..exceptions import XPathDateTimeException
 
+#: Values of the `format` argument of parse_datetime() (and of
+#: XPathDateTimeField and XPathDateTimeListField) for the standard formats.
+#: Any other string is taken as a datetime.strptime() pattern.
+ISO_8601 = "iso8601"
+RFC_3339 = "rfc3339"
+RFC_822 = "rfc822"
+
+
+def parse_isoformat(dt_str):
+    """
+    Parse an ISO 8601 string with the C implementation of
+    datetime.fromisoformat(), raising ValueError for strings it can't handle.
+    """
+    if dt_str.endswith("Z"):
+        # datetime.fromisoformat() only accepts "Z" from Python 3.11
+        dt_str = dt_str[:-1] + "+00:00"
+    return datetime.fromisoformat(dt_str)
+
+
+def parse_datetime(dt_str, format=None):
+    """
+    Parse dt_str into a datetime.datetime.
 
-def parse_datetime(dt_str):
+    If format is None, the string is first parsed as ISO 8601 with
+    datetime.fromisoformat(), falling back to dateutil.parser.parse() for
+    anything else. Otherwise format is one of ISO_8601, RFC_3339, RFC_822
+    or a strptime() pattern, and the string must be in that format.
+    """
+    dt_str = dt_str.strip()
     try:
-        return dateutil.parser.parse(dt_str)
-    except ValueError:
+        if format is None:
+            try:
+                return parse_isoformat(dt_str)
+            except ValueError:
+                return dateutil.parser.parse(dt_str)
+        elif format in (ISO_8601, RFC_3339):
+            try:
+                return parse_isoformat(dt_str)
+            except ValueError:
+                return dateutil.parser.isoparse(dt_str)
+        elif format == RFC_822:
+            dt = email.utils.parsedate_to_datetime(dt_str)
+            if dt is None:
+                raise ValueError(dt_str)
+            return dt
+        else:
+            return datetime.strptime(dt_str, format)
+    except (ValueError, TypeError, OverflowError):
         raise XPathDateTimeException("Could not parse datetime %s" % dt_str)
@@ -1,15 +1,23 @@
 import re
+from array import array
 
 from lxml import etree
 
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ImproperlyConfigured, ValidationError
 
 from django.utils.encoding import force_str
 
 from .base import XmlField
 from ..descriptors import XPathFieldBase
+from ..planner import selects_elements
+from ..pool import XPathPool
 from .utils import parse_datetime
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 __all__ = (
     "XPathField",
     "XPathListField",
@@ -24,6 +32,8 @@ __all__ = (
     "XPathFloatListField",
     "XPathDateTimeListField",
     "XPathBooleanListField",
+    "XPathIntegerArrayField",
+    "XPathFloatArrayField",
     "XPathHtmlField",
     "XPathHtmlListField",
     "XPathInnerHtmlMixin",
@@ -49,6 +59,17 @@ class XPathField(XmlField, metaclass=XPathFieldBase):
 
     required = True
 
+    #: pool.XPathPool of xpath_query, created by compile_xpath()
+    compiled_xpath = None
+
+    #: (prefix, compiled suffix) pairs with which the query is evaluated
+    #: from prefixes shared with other fields, set by planner.plan_fields()
+    xpath_plan = None
+
+    #: Whether string results of the query are lxml "smart strings", which
+    #: keep a reference to the node they came from
+    smart_strings = True
+
     def __init__(self, xpath_query, extra_namespaces=None, extensions=None, **kwargs):
         if isinstance(self.__class__, XPathField):
             raise RuntimeError("%r is an abstract field type.")
@@ -61,6 +82,34 @@ class XPathField(XmlField, metaclass=XPathFieldBase):
 
         super().__init__(**kwargs)
 
+    def compile_xpath(self, opts):
+        """
+        Compile xpath_query with the namespaces and extensions of the model
+        whose Options are passed. Called once when the model class is
+        prepared; the result is shared by all instances of the model, and
+        compiled again for evaluations which overlap (see pool.XPathPool).
+        """
+        namespaces = {}
+        namespaces.update(opts.namespaces)
+        namespaces.update(self.extra_namespaces)
+
+        extensions = {}
+        extensions.update(opts.extension_functions)
+        extensions.update(self.extensions)
+
+        self.compiled_xpath = XPathPool(
+            self.get_compiled_query(),
+            namespaces=namespaces,
+            extensions=extensions,
+            smart_strings=self.smart_strings,
+        )
+
+    def get_compiled_query(self):
+        """
+        The XPath expression passed to lxml.etree.XPath by compile_xpath()
+        """
+        return self.xpath_query
+
     def validate(self, nodes, model_instance):
         super().validate(nodes, model_instance)
         if nodes is None:
@@ -170,6 +219,11 @@ class XPathTextField(XPathSingleNodeField):
     #: A tuple of strings which should be interpreted as None.
     none_vals = ()
 
+    plain_value = True
+
+    # Plain string results, so values don't keep the tree alive
+    smart_strings = False
+
     def __init__(self, *args, **kwargs):
         none_vals = kwargs.pop("none_vals", None)
         if none_vals is not None:
@@ -223,12 +277,20 @@ class XPathFloatField(XPathTextField):
 
 
 class XPathDateTimeField(XPathTextField):
+    #: The format of the datetime strings: "iso8601", "rfc3339", "rfc822" or
+    #: a strptime() pattern. If None, ISO 8601 is tried before dateutil.
+    format = None
+
+    def __init__(self, *args, **kwargs):
+        self.format = kwargs.pop("format", None)
+        super().__init__(*args, **kwargs)
+
     def to_python(self, value):
         value = super().to_python(value)
         if value is None:
             return value
         else:
-            return parse_datetime(value)
+            return parse_datetime(value, self.format)
 
 
 class XPathBooleanField(XPathTextField):
@@ -280,6 +342,10 @@ class XPathBooleanField(XPathTextField):
 
 
 class XPathTextListField(XPathListField):
+    plain_value = True
+
+    smart_strings = False
+
     def to_python(self, value):
         value = super().to_python(value)
         if value is None:
@@ -307,12 +373,21 @@ class XPathFloatListField(XPathTextListField):
 
 
 class XPathDateTimeListField(XPathTextListField):
+    #: The format of the datetime strings: "iso8601", "rfc3339", "rfc822" or
+    #: a strptime() pattern. If None, ISO 8601 is tried before dateutil.
+    format = None
+
+    def __init__(self, *args, **kwargs):
+        self.format = kwargs.pop("format", None)
+        super().__init__(*args, **kwargs)
+
     def to_python(self, value):
         value = super().to_python(value)
         if value is None:
             return value
         else:
-            return [parse_datetime(v) for v in value]
+            datetime_format = self.format
+            return [parse_datetime(v, datetime_format) for v in value]
 
 
 class XPathBooleanListField(XPathTextListField):
@@ -363,6 +438,82 @@ class XPathBooleanListField(XPathTextListField):
             return value
 
 
+class XPathNumberArrayField(XPathListField):
+    """
+    Base class for fields which return the numbers matched by the xpath
+    query as a compact array.array (or numpy array), instead of a list of
+    python numbers.
+    """
+
+    #: array.array typecode of the result
+    typecode = None
+
+    #: Function converting a string to a number of the array's type
+    convert = None
+
+    #: Either "array" for an array.array, or "numpy" for a numpy.ndarray
+    container = "array"
+
+    #: If True, and xpath_query is a location path selecting elements, the
+    #: first child node of each element is selected rather than the element,
+    #: so that its text is read without creating an element proxy.
+    #: WARNING: empty elements have no first child, so they are then left
+    #: out of the array rather than raising an error, and the positions in
+    #: the array no longer match the positions of the matched elements.
+    #: Only use it where every matched element is known to have a number.
+    text_nodes = False
+
+    smart_strings = False
+
+    plain_value = True
+
+    def __init__(self, xpath_query, typecode=None, container="array", text_nodes=False, **kwargs):
+        if typecode is not None:
+            self.typecode = typecode
+        if container not in ("array", "numpy"):
+            raise ValueError("container must be 'array' or 'numpy', not %r" % container)
+        if container == "numpy" and numpy is None:
+            raise ImproperlyConfigured("container='numpy' requires numpy to be installed")
+        self.container = container
+        self.text_nodes = text_nodes
+        super().__init__(xpath_query, **kwargs)
+        self.selects_first_child = text_nodes and selects_elements(xpath_query)
+
+    def get_compiled_query(self):
+        if self.selects_first_child:
+            return "(%s)/node()[1]" % self.xpath_query
+        return self.xpath_query
+
+    def to_number_array(self, values):
+        if self.container == "numpy":
+            return numpy.fromiter(
+                map(self.convert, values), dtype=self.typecode, count=len(values)
+            )
+        return array(self.typecode, map(self.convert, values))
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value is None:
+            return value
+        if self.selects_first_child:
+            # An element's .text is its first child if that is a text node
+            value = [v if isinstance(v, str) else None for v in value]
+        else:
+            # Attribute values and the results of functions are strings
+            value = [getattr(v, "text", v) for v in value]
+        return self.to_number_array(value)
+
+
+class XPathIntegerArrayField(XPathNumberArrayField):
+    typecode = "q"
+    convert = staticmethod(int)
+
+
+class XPathFloatArrayField(XPathNumberArrayField):
+    typecode = "d"
+    convert = staticmethod(float)
+
+
 class XPathHtmlField(XPathSingleNodeField):
     """
     Differs from XPathTextField in that it serializes mixed content to a
@@ -373,6 +524,10 @@ class XPathHtmlField(XPathSingleNodeField):
     #: the serialized html strings
     strip_xhtml_ns = True
 
+    plain_value = True
+
+    smart_strings = False
+
     def __init__(self, xpath_query, strip_xhtml_ns=True, **kwargs):
         self.strip_xhtml_ns = strip_xhtml_ns
         super().__init__(xpath_query, **kwargs)
@@ -402,6 +557,10 @@ class XPathHtmlListField(XPathListField):
     #: the serialized html strings
     strip_xhtml_ns = True
 
+    plain_value = True
+
+    smart_strings = False
+
     def __init__(self, xpath_query, strip_xhtml_ns=True, **kwargs):
         self.strip_xhtml_ns = strip_xhtml_ns
         super().__init__(xpath_query, **kwargs)
@@ -422,8 +581,7 @@ class XPathHtmlListField(XPathListField):
 
 class XPathInnerHtmlMixin(object):
     self_closing_re = re.compile(
-        r"<(area|base(?:font)?|frame|col|br|hr|input|img|link|meta|param)"
-        r"([^/>]*?)></\1>"
+        r"<(area|base(?:font)?|frame|col|br|hr|input|img|link|meta|param)" r"([^/>]*?)></\1>"
     )
 
     def get_inner_html(self, value):
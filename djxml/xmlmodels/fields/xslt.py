@@ -3,13 +3,38 @@ from lxml import etree, isoschematron
 from django.core.exceptions import ValidationError
 
 from .base import XmlField
+from .. import artifacts
 from ..descriptors import XsltFieldBase
 
 
 __all__ = ("XsltField", "SchematronField")
 
 
-class XsltField(XmlField, metaclass=XsltFieldBase):
+class CompiledXsltMixin(object):
+    """
+    Compiles the field's stylesheet into an lxml.etree.XSLT object once and
+    shares it between all instances of the model.
+    """
+
+    _xslt = None
+
+    def get_xslt(self, model_instance):
+        if self._xslt is None:
+            extensions = {}
+            extensions.update(model_instance._meta.extension_functions)
+            extensions.update(self.extensions)
+            self._xslt = etree.XSLT(self.get_xslt_tree(model_instance), extensions=extensions)
+        return self._xslt
+
+    def __deepcopy__(self, memodict):
+        obj = super().__deepcopy__(memodict)
+        # The compiled stylesheet is bound to the extensions of the model
+        # it was contributed to, so a field inherited by a subclass recompiles
+        obj._xslt = None
+        return obj
+
+
+class XsltField(CompiledXsltMixin, XmlField, metaclass=XsltFieldBase):
     #: Instance of lxml.etree.XMLParser
     parser = None
 
@@ -51,7 +76,7 @@ class XsltField(XmlField, metaclass=XsltFieldBase):
         return self._xslt_tree
 
 
-class SchematronField(XmlField, metaclass=XsltFieldBase):
+class SchematronField(CompiledXsltMixin, XmlField, metaclass=XsltFieldBase):
     #: Instance of lxml.etree.XMLParser
     parser = None
 
@@ -100,9 +125,21 @@ class SchematronField(XmlField, metaclass=XsltFieldBase):
 
     def get_xslt_tree(self, model_instance):
         if self._schematron_xslt is None:
-            schematron_tree = self.get_schematron_tree(model_instance)
-            self._schematron = isoschematron.Schematron(schematron_tree, **self.schematron_kwargs)
-            self._schematron_xslt = self._schematron.validator_xslt.getroot()
+            if self.parser is not None:
+                # The output of a custom parser can't be cached by its options
+                schematron_tree = self.get_schematron_tree(model_instance)
+                self._schematron = isoschematron.Schematron(
+                    schematron_tree, **self.schematron_kwargs
+                )
+                self._schematron_xslt = self._schematron.validator_xslt.getroot()
+            else:
+                self._schematron_xslt = artifacts.get_schematron_xslt(
+                    lambda: self.get_schematron_tree(model_instance),
+                    self.schematron_kwargs,
+                    model_instance._meta.parser_opts,
+                    source_file=self.schematron_file,
+                    source_string=self.schematron_string,
+                )
         return self._schematron_xslt
 
     def get_schematron_tree(self, model_instance):
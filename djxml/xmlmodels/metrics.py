@@ -0,0 +1,147 @@
+"""
+Opt-in instrumentation of XPath field, XSLT field and lxml extension
+evaluation.
+
+Usage:
+
+    from djxml.xmlmodels import metrics
+
+    metrics.enable()
+    ...
+    for (model_label, field_name), stats in metrics.snapshot()["fields"].items():
+        print(model_label, field_name, stats["calls"], stats["total_time"])
+    metrics.reset()
+
+While disabled (the default) the only cost to evaluation is a check of the
+module-level `enabled` flag.
+"""
+
+import threading
+import time
+
+from .signals import field_evaluated, extension_called
+
+__all__ = (
+    "enable",
+    "disable",
+    "is_enabled",
+    "snapshot",
+    "reset",
+    "registry",
+)
+
+#: Whether evaluations are being recorded. Use enable() and disable()
+enabled = False
+
+#: Clock used to time evaluations
+timer = time.perf_counter
+
+
+class Stats(object):
+    """
+    Running totals for one field or extension.
+    """
+
+    __slots__ = ("calls", "total_time", "max_time", "total_results", "max_results")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.total_results = 0
+        self.max_results = 0
+
+    def add(self, duration, results=None):
+        self.calls += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+        if results is not None:
+            self.total_results += results
+            if results > self.max_results:
+                self.max_results = results
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class MetricsRegistry(object):
+    """
+    In-process registry of Stats keyed by (model label, field name) for
+    fields and by "{namespace uri}name" for lxml extensions.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.fields = {}
+        self.extensions = {}
+
+    def record_field(self, model, field, duration, results):
+        key = ("%s.%s" % (model._meta.app_label, model._meta.object_name), field.name)
+        with self.lock:
+            stats = self.fields.get(key)
+            if stats is None:
+                stats = self.fields[key] = Stats()
+            stats.add(duration, results)
+        field_evaluated.send(sender=model, field=field, duration=duration, results=results)
+
+    def record_extension(self, model, name, duration):
+        with self.lock:
+            stats = self.extensions.get(name)
+            if stats is None:
+                stats = self.extensions[name] = Stats()
+            stats.add(duration)
+        extension_called.send(sender=model, name=name, duration=duration)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "fields": {k: v.as_dict() for k, v in self.fields.items()},
+                "extensions": {k: v.as_dict() for k, v in self.extensions.items()},
+            }
+
+    def reset(self):
+        with self.lock:
+            self.fields.clear()
+            self.extensions.clear()
+
+
+registry = MetricsRegistry()
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def is_enabled():
+    return enabled
+
+
+def snapshot():
+    """
+    Return a copy of the recorded stats as plain dicts, in the form
+    {"fields": {(model label, field name): stats}, "extensions": {name: stats}}
+    where stats has the keys calls, total_time, max_time (in seconds),
+    total_results and max_results (the number of nodes or values returned).
+    """
+    return registry.snapshot()
+
+
+def reset():
+    registry.reset()
+
+
+def result_count(result):
+    """
+    The cardinality of an XPath or XSLT result: the length of node-sets and
+    lists, 1 for scalar values.
+    """
+    if isinstance(result, list):
+        return len(result)
+    return 1
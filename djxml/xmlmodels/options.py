@@ -1,13 +1,26 @@
+import hashlib
+import threading
 from bisect import bisect
 from collections import OrderedDict
 
 from lxml import etree
 
+import djxml
 from django.core.exceptions import FieldDoesNotExist
 from django.utils.encoding import smart_bytes, smart_str
 
-from .exceptions import ExtensionNamespaceException
+from .artifacts import get_xml_schema
+from .decorators import bind_extension
+from .exceptions import ExtensionNamespaceException, UnstableReprException
 from .fields import XmlPrimaryElementField
+from .fields.base import stable_repr
+from .planner import plan_fields
+from .pool import XPathPool
+from .validation import OFF, PARSE, POST, SampledValidation, check_validation
+
+#: Maximum number of queries passed to XmlModel.xpath() kept compiled per
+#: model by Options.get_compiled_query()
+MAX_COMPILED_QUERIES = 256
 
 DEFAULT_NAMES = (
     "app_label",
@@ -16,6 +29,12 @@ DEFAULT_NAMES = (
     "extension_ns_uri",
     "xsd_schema",
     "xsd_schema_file",
+    "value_cache",
+    "file_value_store",
+    "executor",
+    "compact",
+    "validation",
+    "xpath_planner",
 )
 
 
@@ -29,6 +48,12 @@ class Options(object):
         extension_ns_uri=None,
         xsd_schema=None,
         xsd_schema_file=None,
+        value_cache=None,
+        file_value_store=None,
+        executor=None,
+        compact=None,
+        validation=None,
+        xpath_planner=None,
     ):
         self.local_fields = []
         self.module_name = None
@@ -47,15 +72,50 @@ class Options(object):
 
         # Extensions generated by XmlModelBase.add_to_class()
         self.extensions = {}
+        # The same extensions, wrapped by bind_extension() so that they can
+        # be compiled into XPath and XSLT objects shared by all instances
+        self.extension_functions = {}
+        # pool.XPathPool objects of the queries passed to XmlModel.xpath()
+        self._compiled_queries = {}
+        # Whether the XPath fields' queries are split into shared prefixes
+        # and relative suffixes (see djxml.xmlmodels.planner), can be set in
+        # Meta. Defaults to True
+        self.xpath_planner = xpath_planner
+        # pool.XPathPool objects of the prefixes shared by XPath fields,
+        # set in _prepare(), and those of them which selected several nodes
+        self.xpath_prefixes = {}
+        self.multiple_node_prefixes = set()
 
         # An instance of lxml.etree.XMLSchema, can be set in Meta
         self.xsd_schema = xsd_schema
         # The path to an xml schema file, can be set in Meta
         self.xsd_schema_file = xsd_schema_file
+        # When documents are validated against xsd_schema, one of the modes
+        # in djxml.xmlmodels.validation, can be set in Meta. Defaults to POST
+        self.validation = validation
+
+        # An instance of djxml.xmlmodels.cache.ValueCache, can be set in Meta
+        self.value_cache = value_cache
+        # An instance of djxml.xmlmodels.cache.FileValueStore, can be set in
+        # Meta
+        self.file_value_store = file_value_store
+        # The concurrent.futures.Executor which runs the parsing, XPath and
+        # XSLT work of the async methods (acreate_from_file(), aget(), ...),
+        # can be set in Meta. None means the event loop's default executor
+        self.executor = executor
+        # If true, instances store their fields' values in slots and a list
+        # instead of an instance __dict__, can be set in Meta
+        self.compact = compact
+        # Digests of the model's namespaces and field definitions, set in
+        # _prepare(); part of the keys of cached field values
+        self.definition_digest = None
+        self.field_digests = {}
 
         # Dict passed as kwargs to create lxml.etree.XMLParser instance
         self.parser_opts = parser_opts or {}
-        self.parser = None
+        # lxml parsers can't be used by several threads at once, so each
+        # thread gets its own, created on demand by get_parser()
+        self._thread_local = threading.local()
         self.parents = OrderedDict()
 
     def contribute_to_class(self, cls, name):
@@ -104,17 +164,150 @@ class Options(object):
             root_field = XmlPrimaryElementField()
             model.add_to_class("root", root_field)
         if self.xsd_schema_file is not None:
-            schema_root = etree.parse(self.xsd_schema_file)
-            self.xsd_schema = etree.XMLSchema(schema_root)
+            self.xsd_schema = get_xml_schema(self.xsd_schema_file)
+        if self.validation is None:
+            self.validation = POST
+        check_validation(self.validation)
+        xpath_fields = [f for f in self.fields if hasattr(f, "compile_xpath")]
+        for field in xpath_fields:
+            field.compile_xpath(self)
+        if self.xpath_planner is None:
+            self.xpath_planner = True
+        if self.xpath_planner:
+            plan_fields(self, xpath_fields)
+        else:
+            # Fields copied from a parent model may have been planned
+            for field in xpath_fields:
+                field.xpath_plan = None
+
+        self.field_digests = {f.name: self.get_field_digest(f) for f in self.fields}
+        definition = "\n".join("%s:%s" % item for item in sorted(self.field_digests.items()))
+        self.definition_digest = hashlib.sha1(definition.encode("utf-8")).hexdigest()
+
+    def get_field_digest(self, field):
+        """
+        Returns a hex digest of the definition of field in the model, the
+        same in every process, or None if the field or the model has options
+        without a representation stable across processes.
+        """
+        try:
+            # The namespaces and extensions of the model can change the value
+            # of any field, and so can the version of djxml, which converts
+            # the values
+            definition = "%s\n%s\n%s\n%s" % (
+                djxml.__version__,
+                stable_repr(self.namespaces),
+                stable_repr(self.extensions),
+                field.get_definition_digest(),
+            )
+        except UnstableReprException:
+            return None
+        return hashlib.sha1(definition.encode("utf-8")).hexdigest()
+
+    def create_parser(self, schema=None):
+        """
+        Returns a new lxml.etree.XMLParser built from parser_opts, which
+        validates documents with schema if it is given.
+        """
+        return etree.XMLParser(schema=schema, **self.parser_opts)
+
+    def create_pull_parser(self, tag, schema=None):
+        """
+        Returns a new lxml.etree.XMLPullParser built from parser_opts, which
+        reports the end of each element matching tag.
+        """
+        return etree.XMLPullParser(
+            events=("end",), tag=self.resolve_tag(tag), schema=schema, **self.parser_opts
+        )
 
     def get_parser(self):
-        if self.parser is None:
-            self.parser = etree.XMLParser(**self.parser_opts)
-        return self.parser
+        """
+        Returns the lxml.etree.XMLParser for the current thread.
+        """
+        parser = getattr(self._thread_local, "parser", None)
+        if parser is None:
+            parser = self._thread_local.parser = self.create_parser()
+        return parser
+
+    def get_parse_schema(self):
+        """
+        Returns the xsd_schema if the next document parsed should be
+        validated while it is parsed (see Meta.validation), else None.
+        """
+        if self.xsd_schema is None:
+            return None
+        if self.validation == PARSE:
+            return self.xsd_schema
+        if isinstance(self.validation, SampledValidation):
+            if self.validation.sample():
+                return self.xsd_schema
+        return None
+
+    def set_parsed_root(self, root):
+        """
+        Record that root was just parsed by the model, with the schema from
+        get_parse_schema(), so that the instance created from it doesn't
+        validate it a second time.
+        """
+        if self.xsd_schema is not None and self.validation not in (POST, OFF):
+            self._thread_local.parsed_root = root
+
+    def pop_parsed_root(self, root):
+        """
+        Returns True if root is the root last recorded with set_parsed_root()
+        in the current thread, and forgets it.
+        """
+        if getattr(self._thread_local, "parsed_root", None) is not root:
+            return False
+        self._thread_local.parsed_root = None
+        return True
+
+    def get_document_parser(self):
+        """
+        Returns the parser for the current thread with which to parse the
+        next document of the model: get_parser(), or a parser validating
+        with xsd_schema if the document should be validated while parsed.
+        """
+        schema = self.get_parse_schema()
+        if schema is None:
+            return self.get_parser()
+        parser = getattr(self._thread_local, "schema_parser", None)
+        if parser is None:
+            parser = self._thread_local.schema_parser = self.create_parser(schema=schema)
+        return parser
+
+    def get_compiled_query(self, query):
+        """
+        Returns a pool.XPathPool of query with the model's namespaces and
+        extension functions, compiled once and shared by all instances.
+        """
+        compiled = self._compiled_queries.get(query)
+        if compiled is None:
+            if len(self._compiled_queries) >= MAX_COMPILED_QUERIES:
+                self._compiled_queries.clear()
+            compiled = XPathPool(
+                query, namespaces=self.namespaces, extensions=self.extension_functions
+            )
+            self._compiled_queries[query] = compiled
+        return compiled
+
+    def resolve_tag(self, tag):
+        """
+        Expand a "prefix:name" tag using the model's namespaces into the
+        "{uri}name" form lxml expects. Other tags are returned unchanged.
+        """
+        if tag is None or tag.startswith("{") or ":" not in tag:
+            return tag
+        prefix, name = tag.split(":", 1)
+        try:
+            return "{%s}%s" % (self.namespaces[prefix], name)
+        except KeyError:
+            raise ValueError("Namespace prefix %r of tag %r is not defined" % (prefix, tag))
 
     def add_field(self, field):
         # Insert the given field in the order in which it was created, using
         # the "creation_counter" attribute of the field.
+        field.value_index = len(self.local_fields)
         self.local_fields.insert(bisect(self.local_fields, field), field)
         self.setup_root(field)
         if hasattr(self, "_field_cache"):
@@ -145,6 +338,10 @@ class Options(object):
                 extension_name,
             )
         ] = method
+        self.extension_functions[(ns_uri, extension_name)] = bind_extension(
+            method, ns_uri=ns_uri, extension_name=extension_name
+        )
+        self._compiled_queries.clear()
 
     def setup_root(self, field):
         if not self.root and field.is_root_field:
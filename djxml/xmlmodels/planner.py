@@ -0,0 +1,206 @@
+"""
+Shared evaluation of the location-path prefixes of a model's XPath fields.
+
+Models often have several fields whose queries start with the same steps,
+such as "//atom:entry[atom:link]/atom:title" and
+"//atom:entry[atom:link]/atom:updated". When a model is prepared,
+plan_fields() splits each field's query into a prefix and a relative
+suffix wherever the prefix is shared with another field. The prefix is
+evaluated once per instance, and if it selects a single node, each field
+only evaluates its suffix relative to that node, which gives the same
+result as the whole query.
+
+Only prefixes which search the tree, with predicates or steps other than
+child steps, are shared. A prefix of child steps such as "/atom:feed" costs
+libxml2 no more to evaluate as part of each query than on its own.
+
+Prefixes which select several nodes aren't used: evaluating a suffix once
+per node costs more in lxml than evaluating the whole query once. As the
+documents of a model are usually alike, once a prefix has selected several
+nodes it is skipped for later instances of the model too. Queries
+which aren't plain location paths (unions, function calls, filter
+expressions, variables, ...), fields with their own namespaces or
+extensions, and prefixes whose predicates call extension functions are
+never split, and are evaluated as before.
+"""
+
+import re
+
+from .pool import XPathPool
+
+__all__ = ("split_location_path", "selects_elements", "plan_fields", "evaluate")
+
+NAME = r"[^\W\d][\w.-]*"
+
+#: A location step without its predicates
+STEP_RE = re.compile(
+    r"(?:\.\.?|(?:@|[a-z-]+::)?(?:\*|{name}(?::(?:\*|{name}))?|(?:text|node|comment)\(\)))$".format(
+        name=NAME
+    )
+)
+
+#: A location step which is cheap enough to evaluate as part of each query
+CHILD_STEP_RE = re.compile(r"(?:child::)?(?:\*|{name}(?::(?:\*|{name}))?)$".format(name=NAME))
+
+#: A location step selecting elements, without its predicates
+ELEMENT_STEP_RE = re.compile(
+    r"(?:(?:child|descendant(?:-or-self)?|self|parent|ancestor(?:-or-self)?|following(?:-sibling)?"
+    r"|preceding(?:-sibling)?)::)?(?:\*|{name}(?::(?:\*|{name}))?)$".format(name=NAME)
+)
+
+#: A call of a function with a namespace prefix, i.e. an extension function
+EXTENSION_CALL_RE = re.compile(r"{name}:{name}\s*\(".format(name=NAME))
+
+
+def split_location_path(query):
+    """
+    Split query into its location steps, predicates included, if it is a
+    plain location path; else return None. The steps of an absolute path
+    start with an empty step, and "//" gives an empty step between two
+    others, e.g. "/a//b[1]" is split into ["", "a", "", "b[1]"].
+    """
+    steps = []
+    head, step = [], []
+    depth, quote, has_predicate = 0, None, False
+    for char in query.strip():
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            if depth == 0:
+                return None
+            quote = char
+        elif char == "[":
+            depth += 1
+            has_predicate = True
+        elif char == "]":
+            depth -= 1
+            if depth < 0:
+                return None
+        elif depth == 0:
+            if char == "/":
+                steps.append(("".join(head), "".join(step)))
+                head, step, has_predicate = [], [], False
+                continue
+            if has_predicate:
+                # Something other than a predicate follows a predicate
+                return None
+            head.append(char)
+        step.append(char)
+    if quote is not None or depth != 0:
+        return None
+    steps.append(("".join(head), "".join(step)))
+
+    for i, (head, step) in enumerate(steps):
+        if head == "":
+            # Only the start of an absolute path and "//" give empty steps
+            if step or i == len(steps) - 1 or (i > 1 and steps[i - 1][0] == ""):
+                return None
+        elif not STEP_RE.match(head):
+            return None
+    return [step for head, step in steps]
+
+
+def selects_elements(query):
+    """
+    Return True if query is a plain location path whose last step can only
+    select elements.
+    """
+    steps = split_location_path(query)
+    if steps is None:
+        return False
+    return bool(ELEMENT_STEP_RE.match(steps[-1].split("[", 1)[0]))
+
+
+def get_split_points(steps):
+    """
+    Yield the (prefix, suffix) pairs into which the location path of steps
+    can be split: the prefix ends with a step selecting nodes and searches
+    the tree, and the suffix is a relative location path.
+    """
+    # The empty first step of an absolute path selects the document
+    first = 1 if steps[0] == "" else 0
+    for i in range(1, len(steps)):
+        if steps[i] == "" or steps[i - 1] == "":
+            continue
+        if all(CHILD_STEP_RE.match(step) for step in steps[first:i]):
+            continue
+        prefix = "/".join(steps[:i])
+        if EXTENSION_CALL_RE.search(prefix):
+            continue
+        yield prefix, "/".join(steps[i:])
+
+
+def plan_fields(opts, fields):
+    """
+    Set the xpath_plan of each of fields whose query has a prefix shared
+    with another field, and store the compiled prefixes in
+    opts.xpath_prefixes.
+    """
+    split_points = []
+    for field in fields:
+        field.xpath_plan = None
+        if field.extra_namespaces or field.extensions:
+            continue
+        steps = split_location_path(field.get_compiled_query())
+        if steps is not None:
+            split_points.append((field, list(get_split_points(steps))))
+
+    shared = {}
+    for field, points in split_points:
+        for prefix, suffix in points:
+            shared[prefix] = shared.get(prefix, 0) + 1
+
+    opts.xpath_prefixes = {}
+    opts.multiple_node_prefixes = set()
+    for field, points in split_points:
+        # Longest prefixes first, as they leave the least to evaluate
+        plan = []
+        for prefix, suffix in reversed(points):
+            if shared[prefix] < 2:
+                continue
+            if prefix not in opts.xpath_prefixes:
+                opts.xpath_prefixes[prefix] = XPathPool(
+                    prefix, namespaces=opts.namespaces, extensions=opts.extension_functions
+                )
+            plan.append(
+                (
+                    prefix,
+                    XPathPool(
+                        suffix,
+                        namespaces=opts.namespaces,
+                        extensions=opts.extension_functions,
+                        smart_strings=field.smart_strings,
+                    ),
+                )
+            )
+        field.xpath_plan = tuple(plan) or None
+
+
+def evaluate(field, instance, tree):
+    """
+    Evaluate the query of field, which has an xpath_plan, on tree, the
+    root element of instance. The node-sets of the prefixes are cached on
+    the instance, or None for those which didn't select a single node.
+    """
+    opts = instance._meta
+    prefix_nodes = instance._prefix_nodes
+    if prefix_nodes is None:
+        prefix_nodes = instance._prefix_nodes = {}
+    for prefix, suffix in field.xpath_plan:
+        try:
+            nodes = prefix_nodes[prefix]
+        except KeyError:
+            if prefix in opts.multiple_node_prefixes:
+                continue
+            nodes = opts.xpath_prefixes[prefix](tree)
+            if len(nodes) > 1:
+                opts.multiple_node_prefixes.add(prefix)
+                nodes = None
+            prefix_nodes[prefix] = nodes
+        if nodes is None:
+            continue
+        if not nodes:
+            return []
+        return suffix(nodes[0])
+    return field.compiled_xpath(tree)
@@ -0,0 +1,47 @@
+"""
+Compiled XPath expressions shared by all instances of a model.
+
+An lxml.etree.XPath object holds a lock while it is evaluated, which isn't
+re-entrant: an extension function which evaluates the same expression on
+another node (e.g. the same field of a nested instance of the model) would
+wait on it forever, and threads evaluating the expression at the same time
+are serialized. XPathPool keeps the expression compiled once, and hands
+each concurrent evaluation its own compiled copy.
+"""
+
+from lxml import etree
+
+__all__ = ("XPathPool",)
+
+
+class XPathPool(object):
+    """
+    A callable evaluating path as lxml.etree.XPath(path, **kwargs) does.
+
+    Each call takes an idle XPath object from the pool, compiling a new one
+    if they are all being evaluated, and returns it to the pool afterwards,
+    so the pool only grows to the greatest number of evaluations in
+    progress at once. The first XPath object is compiled straight away, so
+    that errors in path are raised when the pool is created.
+    """
+
+    def __init__(self, path, **kwargs):
+        self.path = path
+        self.kwargs = kwargs
+        self._idle = [self.compile()]
+
+    def compile(self):
+        return etree.XPath(self.path, **self.kwargs)
+
+    def __call__(self, _etree_or_element, **variables):
+        try:
+            xpath = self._idle.pop()
+        except IndexError:
+            xpath = self.compile()
+        try:
+            return xpath(_etree_or_element, **variables)
+        finally:
+            self._idle.append(xpath)
+
+    def __repr__(self):
+        return "XPathPool(%r)" % self.path
@@ -2,3 +2,11 @@ from __future__ import absolute_import
 from django.dispatch import Signal
 
 xmlclass_prepared = Signal()
+
+# Sent when djxml.xmlmodels.metrics is enabled, after an XPath or XSLT field
+# has been evaluated, with the arguments field, duration and results
+field_evaluated = Signal()
+
+# Sent when djxml.xmlmodels.metrics is enabled, after an lxml extension method
+# has been called, with the arguments name and duration
+extension_called = Signal()
@@ -0,0 +1,82 @@
+"""
+Modes of validation of an xml model's documents against its Meta.xsd_schema,
+set with Meta.validation:
+
+    PARSE:         Validate a document while it is parsed, with the schema
+                   attached to the parser, so the tree isn't walked twice.
+                   Trees the model didn't parse are validated as in POST
+    POST:          Validate the tree when it is assigned as the root of an
+                   instance, after parsing (the default)
+    OFF:           Don't validate
+    sampled(rate): Validate a random fraction rate of the documents while
+                   they are parsed, as PARSE does
+"""
+
+import contextlib
+import random
+
+from lxml import etree
+
+from .exceptions import XmlSchemaValidationError
+
+__all__ = ("PARSE", "POST", "OFF", "sampled")
+
+PARSE = "parse"
+POST = "post"
+OFF = "off"
+
+#: The lxml error codes of documents which are well-formed but don't
+#: conform to the schema
+SCHEMA_VALIDITY_ERRORS = frozenset(
+    getattr(etree.ErrorTypes, name)
+    for name in dir(etree.ErrorTypes)
+    if name.startswith("SCHEMAV_")
+)
+
+
+class SampledValidation(object):
+    """
+    Validation of a random fraction of documents while they are parsed.
+    Create with sampled(rate).
+    """
+
+    def __init__(self, rate):
+        if not 0 <= rate <= 1:
+            raise ValueError("The rate of sampled validation must be between 0 and 1")
+        self.rate = rate
+
+    def sample(self):
+        """
+        Returns True if the next document should be validated.
+        """
+        return random.random() < self.rate
+
+    def __repr__(self):
+        return "sampled(%r)" % self.rate
+
+
+def sampled(rate):
+    return SampledValidation(rate)
+
+
+def check_validation(validation):
+    if validation not in (PARSE, POST, OFF) and not isinstance(validation, SampledValidation):
+        raise TypeError(
+            "'class Meta' got attribute 'validation' of %r, expected one of %r, %r, %r or "
+            "sampled(rate)" % (validation, PARSE, POST, OFF)
+        )
+
+
+@contextlib.contextmanager
+def schema_errors():
+    """
+    Raise the errors of documents which are invalid according to the schema
+    of a validating parser as XmlSchemaValidationError, as post-parse
+    validation does. Syntax errors are left as they are.
+    """
+    try:
+        yield
+    except etree.XMLSyntaxError as e:
+        if e.code in SCHEMA_VALIDITY_ERRORS:
+            raise XmlSchemaValidationError(str(e)) from e
+        raise
@@ -0,0 +1,17 @@
+from __future__ import absolute_import
+
+from django.db import models
+
+from djxml import xmlmodels
+from tests.xmlmodels import AtomFeed
+
+
+class Feed(models.Model):
+    title = models.CharField(max_length=255, null=True, blank=True)
+    updated = models.DateTimeField(null=True, blank=True)
+    document = xmlmodels.XmlModelField(
+        AtomFeed, denormalize={"title": "title", "updated": "updated"}, null=True
+    )
+
+    class Meta:
+        app_label = "tests"
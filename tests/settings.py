@@ -1,5 +1,6 @@
 DEBUG = True
 TEMPLATE_DEBUG = True
+INSTALLED_APPS = ["tests"]
 DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
 SECRET_KEY = "z-i*xqqn)r0i7leak^#clq6y5j8&tfslp^a4duaywj2$**s*0_"
 MIDDLEWARE_CLASSES = tuple([])
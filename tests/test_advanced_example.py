@@ -52,3 +52,15 @@ class TestAdvancedExample(test.TestCase):
             ]
         )
         self.assertXmlEqual(expected, etree.tounicode(self.example.transform_to_rss()))
+
+    def test_transform_compiled_once(self):
+        transform = self.example.transform_to_rss
+        self.assertIs(transform, self.example.transform_to_rss)
+        transform()
+        field = AtomFeed._meta.get_field("transform_to_rss")
+        xslt = field.get_xslt(self.example)
+        other = AtomFeed.create_from_file(
+            os.path.join(os.path.dirname(__file__), "data", "atom_feed.xml")
+        )
+        other.transform_to_rss()
+        self.assertIs(field.get_xslt(other), xslt)
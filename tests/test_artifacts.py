@@ -0,0 +1,75 @@
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from lxml import etree
+from django import test
+
+from djxml import xmlmodels
+from djxml.xmlmodels import artifacts
+from tests.xmlmodels import (
+    NUMBERS_SCHEMATRON,
+    NUMBERS_XSD_SOURCE,
+    OtherSchematronNumbers,
+    SchematronNumbers,
+)
+
+NUMBERS_XML = "<numbers><num>1</num><num>-2</num></numbers>"
+
+
+class TestArtifactCache(test.TestCase):
+    def setUp(self):
+        artifacts.cache.clear()
+
+    def get_validator(self, model, field_name):
+        instance = model.create_from_string(NUMBERS_XML)
+        return model._meta.get_field(field_name).get_xslt_tree(instance)
+
+    def test_xml_schema_shared(self):
+        fd, path = tempfile.mkstemp(suffix=".xsd")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "w") as f:
+            f.write(NUMBERS_XSD_SOURCE)
+
+        schema = artifacts.get_xml_schema(path)
+        self.assertIs(artifacts.get_xml_schema(path), schema)
+
+        class SharedSchemaNumbers(xmlmodels.XmlModel):
+            class Meta:
+                xsd_schema_file = path
+
+        self.assertIs(SharedSchemaNumbers._meta.xsd_schema, schema)
+
+        os.utime(path, ns=(10**18, 10**18))
+        self.assertIsNot(artifacts.get_xml_schema(path), schema)
+
+    def test_schematron_shared(self):
+        validator = self.get_validator(SchematronNumbers, "validate")
+        self.assertIs(self.get_validator(OtherSchematronNumbers, "check"), validator)
+        self.assertEqual(len(artifacts.cache), 1)
+        report = OtherSchematronNumbers.create_from_string(NUMBERS_XML).check()
+        self.assertIn(b"A number must be positive", etree.tostring(report))
+
+    def test_persisted_validator(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        def get_validator():
+            return artifacts.get_schematron_xslt(
+                lambda: etree.XML(NUMBERS_SCHEMATRON),
+                {"store_xslt": True},
+                {},
+                source_string=NUMBERS_SCHEMATRON,
+            )
+
+        with self.settings(DJXML_SCHEMATRON_CACHE_DIR=cache_dir):
+            compiled = get_validator()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            artifacts.cache.clear()
+            with mock.patch.object(artifacts, "compile_schematron") as compile_schematron:
+                loaded = get_validator()
+            compile_schematron.assert_not_called()
+            self.assertEqual(etree.tostring(loaded), etree.tostring(compiled))
@@ -0,0 +1,67 @@
+from __future__ import absolute_import
+import asyncio
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from lxml import etree
+from django import test
+
+from tests.test_loading import make_feed
+from tests.xmlmodels import AtomEntry, AtomFeed
+
+ATOM_FEED_FILE = os.path.join(os.path.dirname(__file__), "data", "atom_feed.xml")
+
+
+class TestAsync(test.TestCase):
+    def test_acreate_from_file(self):
+        async def run():
+            feed = await AtomFeed.acreate_from_file(ATOM_FEED_FILE)
+            return await feed.aget("title"), await feed.aget("entries")
+
+        title, entries = asyncio.run(run())
+        self.assertEqual(title, AtomFeed.create_from_file(ATOM_FEED_FILE).title)
+        self.assertEqual(len(entries), 1)
+
+    def test_acreate_from_bytes_and_string(self):
+        async def run():
+            from_bytes = await AtomFeed.acreate_from_bytes(make_feed(2))
+            from_string = await AtomFeed.acreate_from_string(make_feed(3).decode("utf-8"))
+            return len(from_bytes.entries), len(from_string.entries)
+
+        self.assertEqual(asyncio.run(run()), (2, 3))
+
+    def test_xslt_acall(self):
+        feed = AtomFeed.create_from_file(ATOM_FEED_FILE)
+        expected = etree.tounicode(feed.transform_to_rss())
+        result = asyncio.run(feed.transform_to_rss.acall())
+        self.assertEqual(etree.tounicode(result), expected)
+
+    def test_meta_executor(self):
+        thread_names = []
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="djxml-test")
+        self.addCleanup(executor.shutdown)
+        AtomFeed._meta.executor = executor
+        self.addCleanup(setattr, AtomFeed._meta, "executor", None)
+
+        def record_thread(*args, **kwargs):
+            thread_names.append(threading.current_thread().name)
+            return AtomFeed.create_from_bytes(*args, **kwargs)
+
+        async def run():
+            feed = await AtomFeed._run_in_executor(record_thread, make_feed(1))
+            return await feed.aget("title")
+
+        self.assertEqual(asyncio.run(run()), "Feed")
+        self.assertTrue(thread_names[0].startswith("djxml-test"))
+
+    def test_aiter_from_file(self):
+        async def run():
+            titles = []
+            async for entry in AtomEntry.aiter_from_file(io.BytesIO(make_feed(4)), "atom:entry"):
+                self.assertIsInstance(entry, AtomEntry)
+                titles.append(await entry.aget("title"))
+            return titles
+
+        self.assertEqual(asyncio.run(run()), ["Entry %d" % i for i in range(4)])
@@ -0,0 +1,51 @@
+from __future__ import absolute_import
+import os
+
+from lxml import etree
+from django import test
+
+from djxml import xmlmodels
+from tests.xmlmodels import AtomEntryDetails, AtomEntryLinks, AtomFeed
+
+ATOM_FEED_FILE = os.path.join(os.path.dirname(__file__), "data", "atom_feed.xml")
+
+ENTRY_PREFIX = "//atom:entry[atom:link/@rel='alternate']"
+
+
+class TestBind(test.TestCase):
+    def setUp(self):
+        with open(ATOM_FEED_FILE, "rb") as f:
+            self.xml_bytes = f.read()
+        for model in (AtomEntryDetails, AtomEntryLinks):
+            model._meta.multiple_node_prefixes.clear()
+
+    def test_shared_root(self):
+        for source in (self.xml_bytes, self.xml_bytes.decode("utf-8")):
+            feed, details = xmlmodels.bind(source, AtomFeed, AtomEntryDetails)
+            self.assertIsInstance(feed, AtomFeed)
+            self.assertIsInstance(details, AtomEntryDetails)
+            self.assertIs(feed.root, details.root)
+            self.assertEqual(feed.title, details.feed_title)
+            self.assertEqual(details.titles, [feed.entries[0].title])
+
+    def test_tree_source(self):
+        tree = etree.parse(ATOM_FEED_FILE)
+        for source in (tree, tree.getroot()):
+            [feed] = xmlmodels.bind(source, AtomFeed)
+            self.assertIs(feed.root, tree.getroot())
+
+    def test_shared_prefix_nodes(self):
+        details, links, feed = xmlmodels.bind(
+            self.xml_bytes, AtomEntryDetails, AtomEntryLinks, AtomFeed
+        )
+        self.assertIs(details._prefix_nodes, links._prefix_nodes)
+        # AtomFeed has other namespaces, so its prefixes could differ
+        self.assertIsNot(details._prefix_nodes, feed._prefix_nodes)
+        self.assertEqual(details.titles, ["An example entry"])
+        [entry] = links._prefix_nodes[ENTRY_PREFIX]
+        self.assertEqual(links.hrefs, ["http://example.org/2003/12/13/atom03"])
+        self.assertIs(links._prefix_nodes[ENTRY_PREFIX][0], entry)
+
+    def test_no_models(self):
+        with self.assertRaises(TypeError):
+            xmlmodels.bind(self.xml_bytes)
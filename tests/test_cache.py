@@ -0,0 +1,138 @@
+from __future__ import absolute_import
+import functools
+import os
+import tempfile
+from unittest import mock
+
+from django import test
+from lxml import etree
+
+import djxml
+from djxml import xmlmodels
+from djxml.xmlmodels.exceptions import UnstableReprException
+from djxml.xmlmodels.fields.base import stable_repr
+from tests.xmlmodels import CachedNumbers, StoredNumbers
+
+
+def make_numbers(*numbers):
+    return ("<numbers>%s</numbers>" % "".join("<num>%d</num>" % n for n in numbers)).encode()
+
+
+class TestValueCache(test.TestCase):
+    def setUp(self):
+        self.cache = CachedNumbers._meta.value_cache
+        self.cache.clear()
+
+    def test_cached_values_skip_parsing(self):
+        first = CachedNumbers.create_from_bytes(make_numbers(1, 2, 3))
+        self.assertEqual(first.total, 6)
+        self.assertEqual(first.all_numbers, [1, 2, 3])
+
+        second = CachedNumbers.create_from_bytes(make_numbers(1, 2, 3))
+        self.assertEqual(second.total, 6)
+        self.assertEqual(second.all_numbers, [1, 2, 3])
+        self.assertIsNotNone(second._deferred_root, "document was parsed")
+
+    def test_uncached_field_parses(self):
+        CachedNumbers.create_from_bytes(make_numbers(1, 2)).total
+        instance = CachedNumbers.create_from_bytes(make_numbers(1, 2))
+        self.assertEqual(len(instance.nodes), 2)
+        self.assertIsNone(instance._deferred_root)
+        self.assertEqual(instance.root.tag, "numbers")
+        self.assertEqual(instance.total, 3)
+
+    def test_string_source(self):
+        CachedNumbers.create_from_string(make_numbers(4).decode()).total
+        instance = CachedNumbers.create_from_string(make_numbers(4).decode())
+        self.assertEqual(instance.total, 4)
+        self.assertIsNotNone(instance._deferred_root)
+
+    def test_lru_eviction(self):
+        for i in range(200):
+            CachedNumbers.create_from_bytes(make_numbers(i, i)).all_numbers
+        self.assertLessEqual(self.cache.bytes_used, self.cache.max_bytes)
+        self.assertLess(len(self.cache), 200)
+        # The most recently used document is still cached
+        instance = CachedNumbers.create_from_bytes(make_numbers(199, 199))
+        self.assertEqual(instance.all_numbers, [199, 199])
+        self.assertIsNotNone(instance._deferred_root)
+
+
+class TestFileValueStore(test.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.store = xmlmodels.FileValueStore(os.path.join(tmpdir.name, "values.sqlite3"))
+        self.addCleanup(self.store.close)
+        StoredNumbers._meta.file_value_store = self.store
+        self.addCleanup(setattr, StoredNumbers._meta, "file_value_store", None)
+        self.path = os.path.join(tmpdir.name, "numbers.xml")
+        self.write(make_numbers(1, 2, 3))
+
+    def write(self, xml_bytes, mtime_ns=None):
+        with open(self.path, "wb") as f:
+            f.write(xml_bytes)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_stored_values_skip_parsing(self):
+        self.assertEqual(StoredNumbers.create_from_file(self.path).total, 6)
+
+        instance = StoredNumbers.create_from_file(self.path)
+        self.assertEqual(instance.total, 6)
+        self.assertIsNotNone(instance._deferred_root, "file was parsed")
+
+        instance.all_numbers
+        self.assertIsNone(instance._deferred_root)
+
+    def test_changed_file_is_parsed(self):
+        self.write(make_numbers(1, 2, 3), mtime_ns=10**18)
+        self.assertEqual(StoredNumbers.create_from_file(self.path).total, 6)
+        self.write(make_numbers(1, 2, 4), mtime_ns=10**18 + 10**9)
+        instance = StoredNumbers.create_from_file(self.path)
+        self.assertEqual(instance.total, 7)
+        self.assertIsNone(instance._deferred_root)
+
+    def test_changed_definition_is_reevaluated(self):
+        StoredNumbers.create_from_file(self.path).values("total", "all_numbers")
+        field_digests = StoredNumbers._meta.field_digests
+        self.addCleanup(setattr, StoredNumbers._meta, "field_digests", dict(field_digests))
+        StoredNumbers._meta.field_digests = dict(field_digests, total="changed")
+
+        instance = StoredNumbers.create_from_file(self.path)
+        self.assertEqual(instance.all_numbers, [1, 2, 3])
+        self.assertIsNotNone(instance._deferred_root)
+        self.assertEqual(instance.total, 6)
+        self.assertIsNone(instance._deferred_root)
+
+    def test_unstable_definition_isnt_stored(self):
+        self.assertIsNone(StoredNumbers._meta.field_digests["first_number"])
+        StoredNumbers.create_from_file(self.path).values("total", "first_number")
+        instance = StoredNumbers.create_from_file(self.path)
+        self.assertEqual(instance.total, 6)
+        self.assertIsNotNone(instance._deferred_root)
+        self.assertEqual(instance.first_number, 1)
+        self.assertIsNone(instance._deferred_root)
+
+    def test_version_in_digest(self):
+        opts = StoredNumbers._meta
+        field = opts.get_field("total")
+        digest = opts.get_field_digest(field)
+        with mock.patch.object(djxml, "__version__", "0.0.0"):
+            self.assertNotEqual(opts.get_field_digest(field), digest)
+
+
+class TestStableRepr(test.TestCase):
+    def test_stable_values(self):
+        self.assertEqual(
+            stable_repr({"b": [1, None], "a": functools.partial(make_numbers, 1)}),
+            "{'a': partial([tests.test_cache.make_numbers, [1], {}]), 'b': [1, None]}",
+        )
+
+    def test_unstable_values(self):
+        with self.assertRaises(UnstableReprException):
+            stable_repr(etree.XMLParser())
+        with self.assertRaises(UnstableReprException):
+            stable_repr({"a": [object()]})
+        with self.assertRaises(UnstableReprException):
+            stable_repr(etree.XMLParser().feed)
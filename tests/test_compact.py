@@ -0,0 +1,71 @@
+from __future__ import absolute_import
+import os
+import weakref
+
+from lxml import etree
+from django import test
+
+from tests.xmlmodels import AtomFeed, CompactAtomFeed, CompactAtomFeedSubclass
+
+ATOM_FEED_FILE = os.path.join(os.path.dirname(__file__), "data", "atom_feed.xml")
+
+
+class TestCompact(test.TestCase):
+    def setUp(self):
+        CompactAtomFeed._meta.value_cache.clear()
+
+    def test_no_instance_dict(self):
+        for model in (CompactAtomFeed, CompactAtomFeedSubclass):
+            feed = model.create_from_file(ATOM_FEED_FILE)
+            self.assertFalse(hasattr(feed, "__dict__"))
+            self.assertFalse(hasattr(feed.entries[0], "__dict__"))
+            self.assertIs(weakref.ref(feed)(), feed)
+
+    def test_field_values(self):
+        feed = CompactAtomFeed.create_from_file(ATOM_FEED_FILE)
+        expected = AtomFeed.create_from_file(ATOM_FEED_FILE)
+        self.assertEqual(feed.title, expected.title)
+        self.assertIs(feed.entries, feed.entries)
+        self.assertEqual(
+            [(e.title, e.updated) for e in feed.entries],
+            [(e.title, e.updated) for e in expected.entries],
+        )
+        self.assertIs(feed.copy, feed.copy)
+        self.assertEqual(etree.tounicode(feed.copy()), etree.tounicode(feed.root.getroottree()))
+
+    def test_subclass_fields(self):
+        feed = CompactAtomFeedSubclass.create_from_file(ATOM_FEED_FILE)
+        self.assertEqual(feed.title, CompactAtomFeed.create_from_file(ATOM_FEED_FILE).title)
+        self.assertEqual(feed.feed_id, "urn:uuid:60a76c80-d399-11d9-b93C-0003939e0af6")
+
+    def test_subclass_not_compact(self):
+        with self.assertRaises(TypeError):
+
+            class NotCompactAtomFeed(CompactAtomFeed):
+                class Meta:
+                    compact = False
+
+        class CompactAtomFeedSubclassSubclass(CompactAtomFeedSubclass):
+            class Meta:
+                compact = True
+
+        self.assertFalse(
+            hasattr(CompactAtomFeedSubclassSubclass(etree.Element("feed")), "__dict__")
+        )
+
+    def test_immutable(self):
+        feed = CompactAtomFeed.create_from_file(ATOM_FEED_FILE)
+        with self.assertRaises(TypeError):
+            feed.root = etree.Element("feed")
+        with self.assertRaises(AttributeError):
+            feed.extra = 1
+
+    def test_value_cache(self):
+        with open(ATOM_FEED_FILE, "rb") as f:
+            xml_bytes = f.read()
+        title = CompactAtomFeed.create_from_bytes(xml_bytes).title
+        feed = CompactAtomFeed.create_from_bytes(xml_bytes)
+        self.assertEqual(feed.title, title)
+        self.assertIsNotNone(feed._deferred_root)
+        self.assertEqual(len(feed.entries), 1)
+        self.assertIsNone(feed._deferred_root)
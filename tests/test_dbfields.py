@@ -0,0 +1,72 @@
+from __future__ import absolute_import
+import os
+from datetime import datetime, timezone
+
+from django import test
+
+from tests.models import Feed
+from tests.xmlmodels import AtomFeed
+
+ATOM_FEED_FILE = os.path.join(os.path.dirname(__file__), "data", "atom_feed.xml")
+
+
+class TestXmlModelField(test.TestCase):
+    def setUp(self):
+        with open(ATOM_FEED_FILE, "rb") as f:
+            self.xml_bytes = f.read()
+
+    def test_denormalize(self):
+        Feed.objects.create(document=self.xml_bytes.decode("utf-8"))
+        feed = Feed.objects.get(title="Example Feed")
+        self.assertEqual(feed.updated, datetime(2012, 7, 5, 18, 30, 2, tzinfo=timezone.utc))
+
+    def test_parsed_on_first_access(self):
+        Feed.objects.create(document=self.xml_bytes.decode("utf-8"))
+        feed = Feed.objects.get()
+        self.assertIsInstance(feed.__dict__["document"], str)
+        self.assertNotIn("_document_xml_cache", feed.__dict__)
+        self.assertIsInstance(feed.document, AtomFeed)
+        self.assertIs(feed.document, feed.document)
+        self.assertEqual(feed.document.title, "Example Feed")
+
+        # Assigning another document replaces the parsed instance
+        feed.document = feed.__dict__["document"].replace("Example Feed", "Other Feed")
+        self.assertEqual(feed.document.title, "Other Feed")
+        feed.save()
+        self.assertEqual(Feed.objects.get().title, "Other Feed")
+
+    def test_assign_xml_model_instance(self):
+        for document in (self.xml_bytes, AtomFeed.create_from_bytes(self.xml_bytes)):
+            feed = Feed.objects.create(document=document)
+            feed = Feed.objects.get(pk=feed.pk)
+            self.assertIsInstance(feed.__dict__["document"], str)
+            self.assertEqual(feed.document.title, "Example Feed")
+            self.assertEqual(feed.title, "Example Feed")
+
+    def test_null(self):
+        feed = Feed.objects.create(title="No document")
+        feed = Feed.objects.get(pk=feed.pk)
+        self.assertIsNone(feed.document)
+        self.assertIsNone(feed.title)
+
+    def test_denormalize_bulk_create(self):
+        Feed.objects.bulk_create([Feed(document=self.xml_bytes.decode("utf-8"))])
+        self.assertEqual(Feed.objects.get().title, "Example Feed")
+
+    def test_denormalize_update_fields(self):
+        feed = Feed.objects.create(document=self.xml_bytes.decode("utf-8"))
+        feed.document = feed.__dict__["document"].replace("Example Feed", "Other Feed")
+        feed.save(update_fields=["document"])
+        self.assertEqual(Feed.objects.get().title, "Example Feed")
+        feed.save(update_fields=["document", "title"])
+        self.assertEqual(Feed.objects.get().title, "Other Feed")
+
+    def test_full_clean(self):
+        feed = Feed(document=self.xml_bytes)
+        feed.full_clean()
+        feed.save()
+        feed.full_clean()
+        feed.save()
+        feed = Feed.objects.get()
+        self.assertEqual(feed.document.title, "Example Feed")
+        self.assertEqual(feed.title, "Example Feed")
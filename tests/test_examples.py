@@ -1,7 +1,9 @@
 from __future__ import absolute_import
+import threading
+
 from django import test
 
-from tests.xmlmodels import NumbersExample
+from tests.xmlmodels import NestedNode, NumbersExample
 
 
 class TestExamples(test.TestCase):
@@ -27,3 +29,80 @@ class TestExamples(test.TestCase):
     def test_lxml_list_extension(self):
         example = NumbersExample.create_from_string(self.numbers_xml)
         self.assertEqual(example.square_numbers, [1, 4, 9, 16, 25, 36, 49])
+
+    def test_compiled_xpath_shared_between_instances(self):
+        first = NumbersExample.create_from_string(self.numbers_xml)
+        second = NumbersExample.create_from_string("<numbers><num>8</num><num>9</num></numbers>")
+        field = NumbersExample._meta.get_field("square_numbers")
+        self.assertIsNotNone(field.compiled_xpath)
+        self.assertEqual(first.square_numbers, [1, 4, 9, 16, 25, 36, 49])
+        self.assertEqual(second.square_numbers, [64, 81])
+        self.assertEqual(second.even_numbers, [8])
+
+    def test_compiled_xpath_reentrant(self):
+        # An extension evaluating the same field of a nested instance used to
+        # wait forever on the lock of the field's shared lxml.etree.XPath
+        node = NestedNode.create_from_string("<node><node><node/></node><node/></node>")
+        depths = []
+        thread = threading.Thread(target=lambda: depths.append(node.depth), daemon=True)
+        thread.start()
+        thread.join(10)
+        self.assertEqual(depths, [3])
+
+    def test_xpath_reentrant(self):
+        node = NestedNode.create_from_string("<node><node><node/></node><node/></node>")
+        depths = []
+        thread = threading.Thread(
+            target=lambda: depths.append(node.xpath("fn:xpath_depth(.)")), daemon=True
+        )
+        thread.start()
+        thread.join(10)
+        self.assertEqual(depths, [3.0])
+
+    def test_xpath_variables(self):
+        example = NumbersExample.create_from_string(self.numbers_xml)
+        self.assertEqual(example.xpath("//num[. > $n]/text()", n=5), ["6", "7"])
+        self.assertEqual(example.default_xpath_eval("count(//num[. > $n])", n=5), 2.0)
+        self.assertEqual(
+            example.xpath("count(//num[. > $n])", namespaces={"x": "urn:local:extra"}, n=6), 1.0
+        )
+
+    def test_xpath_extensions(self):
+        example = NumbersExample.create_from_string(self.numbers_xml)
+        self.assertEqual(example.xpath("//num[fn:is_even(.)]/text()"), ["2", "4", "6"])
+        self.assertEqual(example.xpath("fn:square(//num[1])"), ["1"])
+        compiled = NumbersExample._meta.get_compiled_query("//num[fn:is_even(.)]/text()")
+        other = NumbersExample.create_from_string("<numbers><num>8</num></numbers>")
+        self.assertEqual(other.xpath("//num[fn:is_even(.)]/text()"), ["8"])
+        self.assertIs(
+            NumbersExample._meta.get_compiled_query("//num[fn:is_even(.)]/text()"), compiled
+        )
+
+    def test_xpath_extra_namespaces_and_extensions(self):
+        example = NumbersExample.create_from_string(self.numbers_xml)
+        extensions = {("urn:local:extra", "double"): lambda context, n: n * 2}
+        self.assertEqual(
+            example.xpath(
+                "x:double(count(//num[fn:is_even(.)]))",
+                namespaces={"x": "urn:local:extra"},
+                extensions=extensions,
+            ),
+            6.0,
+        )
+        self.assertNotIn("x", NumbersExample._meta.namespaces)
+
+    def test_values(self):
+        example = NumbersExample.create_from_string(self.numbers_xml)
+        self.assertEqual(example.values("all_numbers"), {"all_numbers": [1, 2, 3, 4, 5, 6, 7]})
+        self.assertFalse(hasattr(example, "_even_numbers_cache"))
+
+    def test_to_dict(self):
+        example = NumbersExample.create_from_string(self.numbers_xml)
+        self.assertEqual(
+            example.to_dict(),
+            {
+                "all_numbers": [1, 2, 3, 4, 5, 6, 7],
+                "even_numbers": [2, 4, 6],
+                "square_numbers": [1, 4, 9, 16, 25, 36, 49],
+            },
+        )
@@ -0,0 +1,133 @@
+from __future__ import absolute_import
+import gc
+from array import array
+from datetime import datetime, timezone
+
+from django import test
+
+from djxml import xmlmodels
+from djxml.xmlmodels.exceptions import XPathDateTimeException
+from djxml.xmlmodels.fields.related import EmbeddedModelList
+from tests.test_loading import make_feed
+from tests.xmlmodels import ArraysExample, AtomFeed, DatesExample
+
+
+class TestDateTimeFields(test.TestCase):
+    dates_xml = """
+        <dates>
+            <iso>2012-07-05T18:30:02Z</iso>
+            <iso>2012-07-05T18:30:02.250+02:00</iso>
+            <iso>July 5, 2012</iso>
+            <rfc822>Thu, 05 Jul 2012 18:30:02 +0000</rfc822>
+            <custom>05/07/2012</custom>
+        </dates>"""
+
+    def test_iso_with_fallback(self):
+        example = DatesExample.create_from_string(self.dates_xml)
+        self.assertEqual(
+            example.iso_dates,
+            [
+                datetime(2012, 7, 5, 18, 30, 2, tzinfo=timezone.utc),
+                datetime(2012, 7, 5, 16, 30, 2, 250000, tzinfo=timezone.utc),
+                datetime(2012, 7, 5),
+            ],
+        )
+
+    def test_formats(self):
+        example = DatesExample.create_from_string(self.dates_xml)
+        self.assertEqual(example.rfc822_date, datetime(2012, 7, 5, 18, 30, 2, tzinfo=timezone.utc))
+        self.assertEqual(example.custom_date, datetime(2012, 7, 5))
+
+    def test_invalid(self):
+        example = DatesExample.create_from_string("<dates><custom>2012-07-05</custom></dates>")
+        with self.assertRaises(XPathDateTimeException):
+            example.custom_date
+
+
+class TestNumberArrayFields(test.TestCase):
+    numbers_xml = "<values><v>1</v><v> 2 </v><v>3</v><v>10</v></values>"
+
+    def test_integer_array(self):
+        example = ArraysExample.create_from_string(self.numbers_xml)
+        self.assertEqual(example.integers, array("q", [1, 2, 3, 10]))
+        # Converted with int(), as XPathIntegerListField converts them
+        example = ArraysExample.create_from_string("<values><v>3.0</v></values>")
+        with self.assertRaises(ValueError):
+            example.integers
+        self.assertEqual(example.floats, array("d", [3.0]))
+
+    def test_float_array(self):
+        example = ArraysExample.create_from_string(self.numbers_xml)
+        self.assertEqual(example.floats, array("d", [1.0, 2.0, 3.0, 10.0]))
+
+    def test_text_nodes(self):
+        example = ArraysExample.create_from_string(self.numbers_xml)
+        self.assertEqual(example.text_integers, array("q", [1, 2, 3, 10]))
+        # Only the text before the first child is read, as with .text, and
+        # empty elements are left out
+        example = ArraysExample.create_from_string("<values><v>1<!--c-->2</v><v/></values>")
+        self.assertEqual(example.text_integers, array("q", [1]))
+        with self.assertRaises(TypeError):
+            example.integers
+        example = ArraysExample.create_from_string("<values><v><b>1</b></v></values>")
+        with self.assertRaises(TypeError):
+            example.text_integers
+
+    def test_mixed_content(self):
+        example = ArraysExample.create_from_string("<values><v>1<!--c-->2</v><v>3</v></values>")
+        self.assertEqual(example.integers, array("q", [1, 3]))
+
+    def test_attributes(self):
+        example = ArraysExample.create_from_string('<values><v n="1"/><v n="2"/></values>')
+        self.assertEqual(example.attribute_integers, array("q", [1, 2]))
+
+    def test_query_returning_strings(self):
+        example = ArraysExample.create_from_string("<values><v>1</v><v>4</v></values>")
+        self.assertEqual(example.halves, array("d", [0.5, 2.0]))
+
+    def test_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy is not installed")
+
+        class NumpyExample(xmlmodels.XmlModel):
+            floats = xmlmodels.XPathFloatArrayField("//v", container="numpy")
+
+        example = NumpyExample.create_from_string(self.numbers_xml)
+        self.assertIsInstance(example.floats, numpy.ndarray)
+        self.assertEqual(example.floats.tolist(), [1.0, 2.0, 3.0, 10.0])
+
+
+class TestEmbeddedXPathListField(test.TestCase):
+    def setUp(self):
+        self.feed = AtomFeed.create_from_bytes(make_feed(5))
+
+    def test_lazy_instances(self):
+        entries = self.feed.entries
+        self.assertIsInstance(entries, EmbeddedModelList)
+        self.assertEqual(len(entries), 5)
+        self.assertEqual(len(entries.instances), 0)
+        second, last = entries[1], entries[-1]
+        self.assertEqual(second.title, "Entry 1")
+        self.assertEqual(last.title, "Entry 4")
+        self.assertEqual(sorted(entries.instances.keys()), [1, 4])
+
+    def test_slicing_and_iteration(self):
+        entries = self.feed.entries
+        self.assertEqual([e.title for e in entries[1:4:2]], ["Entry 1", "Entry 3"])
+        self.assertEqual([e.title for e in entries], ["Entry %d" % i for i in range(5)])
+        self.assertEqual(entries[:2], [entries[0], entries[1]])
+        with self.assertRaises(IndexError):
+            entries[5]
+        with self.assertRaises(IndexError):
+            entries[-6]
+
+    def test_weak_cache(self):
+        entries = self.feed.entries
+        first = entries[0]
+        self.assertIs(entries[0], first)
+        del first
+        gc.collect()
+        self.assertNotIn(0, entries.instances)
+        self.assertEqual(entries[0].title, "Entry 0")
@@ -0,0 +1,143 @@
+from __future__ import absolute_import
+import io
+import os
+import tempfile
+import threading
+
+from lxml import etree
+from django import test
+
+from tests.xmlmodels import AtomEntry, AtomFeed
+
+
+def make_feed(num_entries):
+    entries = "".join(
+        "<entry><title>Entry %(i)d</title><id>urn:entry:%(i)d</id>"
+        "<updated>2012-07-05T18:30:0%(i)dZ</updated></entry>" % {"i": i}
+        for i in range(num_entries)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom"><title>Feed</title>%s</feed>' % entries
+    ).encode("utf-8")
+
+
+class TestCreateFromBytes(test.TestCase):
+    def test_declared_encoding_honored(self):
+        xml_bytes = (
+            '<?xml version="1.0" encoding="iso-8859-1"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom"><title>Caf\xe9</title></feed>'
+        ).encode("iso-8859-1")
+        self.assertEqual(AtomFeed.create_from_bytes(xml_bytes).title, "Caf\xe9")
+        self.assertEqual(AtomFeed.create_from_string(xml_bytes).title, "Caf\xe9")
+
+    def test_create_from_fileobj(self):
+        feed = AtomFeed.create_from_fileobj(io.BytesIO(make_feed(2)))
+        self.assertEqual(feed.title, "Feed")
+        self.assertEqual(len(feed.entries), 2)
+
+
+class TestIterFromFile(test.TestCase):
+    def test_yields_instance_per_tag(self):
+        entries = AtomEntry.iter_from_file(io.BytesIO(make_feed(3)), tag="atom:entry")
+        titles = []
+        for entry in entries:
+            self.assertIsInstance(entry, AtomEntry)
+            titles.append(entry.title)
+            self.assertEqual(entry.updated.second, len(titles) - 1)
+        self.assertEqual(titles, ["Entry 0", "Entry 1", "Entry 2"])
+
+    def test_releases_consumed_elements(self):
+        preceding = []
+        for entry in AtomEntry.iter_from_file(io.BytesIO(make_feed(5)), tag="atom:entry"):
+            preceding.append(len(list(entry.root.itersiblings(preceding=True))))
+        # Only the feed <title> precedes the first entry; everything before
+        # the later entries has already been removed from the tree
+        self.assertEqual(preceding, [1, 0, 0, 0, 0])
+
+    def test_parser_opts(self):
+        class CleanAtomEntry(AtomEntry):
+            class Meta:
+                parser_opts = {"ns_clean": True, "remove_comments": True}
+
+        entries = CleanAtomEntry.iter_from_file(io.BytesIO(make_feed(2)), tag="atom:entry")
+        self.assertEqual([e.title for e in entries], ["Entry 0", "Entry 1"])
+
+    def test_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "feed.xml")
+            with open(path, "wb") as f:
+                f.write(make_feed(2))
+            entries = AtomEntry.iter_from_file(path, tag="atom:entry")
+            self.assertEqual([e.title for e in entries], ["Entry 0", "Entry 1"])
+
+
+class TestPushParser(test.TestCase):
+    def test_instances_per_chunk(self):
+        parser = AtomEntry.push_parser(tag="atom:entry")
+        xml_bytes = make_feed(4)
+        titles = []
+        for offset in range(0, len(xml_bytes), 50):
+            for entry in parser.feed(xml_bytes[offset : offset + 50]):
+                self.assertIsInstance(entry, AtomEntry)
+                titles.append(entry.title)
+        self.assertEqual(parser.close(), [])
+        self.assertEqual(titles, ["Entry 0", "Entry 1", "Entry 2", "Entry 3"])
+
+    def test_releases_consumed_elements(self):
+        parser = AtomEntry.push_parser(tag="atom:entry")
+        xml_bytes = make_feed(3)
+        head, tail = xml_bytes.split(b"</entry>", 1)
+        [first] = parser.feed(head + b"</entry>")
+        self.assertEqual(len(first.root), 3)
+        second, third = parser.feed(tail.replace(b"</feed>", b""))
+        self.assertIsNone(first.root.getparent())
+        self.assertEqual(len(first.root), 0)
+        # Elements returned by the same call aren't released until the next
+        self.assertIs(third.root.getprevious(), second.root)
+        self.assertEqual(parser.feed(b"</feed>"), [])
+        self.assertIsNone(second.root.getparent())
+        self.assertIsNone(third.root.getparent())
+        self.assertEqual(parser.close(), [])
+
+    def test_incomplete_document(self):
+        parser = AtomEntry.push_parser(tag="atom:entry")
+        parser.feed(make_feed(1).replace(b"</feed>", b""))
+        with self.assertRaises(etree.XMLSyntaxError):
+            parser.close()
+
+
+class TestGetParser(test.TestCase):
+    def test_parser_per_thread(self):
+        opts = AtomFeed._meta
+        parsers = []
+        thread = threading.Thread(target=lambda: parsers.append(opts.get_parser()))
+        thread.start()
+        thread.join()
+        self.assertIs(opts.get_parser(), opts.get_parser())
+        self.assertIsNot(parsers[0], opts.get_parser())
+
+
+class TestExtractMany(test.TestCase):
+    def test_extract_many(self):
+        sources = [make_feed(i).replace(b"<title>Feed", b"<title>Feed %d" % i) for i in range(5)]
+        results = list(AtomFeed.extract_many(iter(sources), workers=2, chunksize=2))
+        self.assertEqual([r["title"] for r in results], ["Feed %d" % i for i in range(5)])
+        self.assertEqual(sorted(results[0]), ["title", "updated"])
+
+    def test_extract_many_lazy(self):
+        consumed = []
+
+        def sources():
+            for i in range(20):
+                consumed.append(i)
+                yield make_feed(i)
+
+        results = AtomFeed.extract_many(sources(), fields=("title",), workers=1, chunksize=1)
+        self.assertEqual(next(results), {"title": "Feed"})
+        self.assertLess(len(consumed), 20)
+        results.close()
+
+    def test_extract_many_fields(self):
+        results = list(AtomFeed.extract_many([make_feed(1)], fields=("title",), workers=1))
+        self.assertEqual(results, [{"title": "Feed"}])
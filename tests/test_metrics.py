@@ -0,0 +1,51 @@
+from __future__ import absolute_import
+from django import test
+
+from djxml.xmlmodels import metrics, signals
+from tests.xmlmodels import NumbersExample
+
+
+class TestMetrics(test.TestCase):
+    numbers_xml = "<numbers><num>1</num><num>2</num><num>3</num></numbers>"
+
+    def setUp(self):
+        metrics.reset()
+        metrics.enable()
+        self.addCleanup(metrics.reset)
+        self.addCleanup(metrics.disable)
+
+    def test_field_and_extension_stats(self):
+        for _ in range(2):
+            example = NumbersExample.create_from_string(self.numbers_xml)
+            self.assertEqual(example.square_numbers, [1, 4, 9])
+            self.assertEqual(example.even_numbers, [2])
+
+        snapshot = metrics.snapshot()
+        stats = snapshot["fields"][("tests.NumbersExample", "square_numbers")]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["total_results"], 6)
+        self.assertEqual(stats["max_results"], 3)
+        self.assertGreater(stats["total_time"], 0)
+
+        is_even = snapshot["extensions"]["{urn:local:number-functions}is_even"]
+        # is_even is called once per <num> node, per document
+        self.assertEqual(is_even["calls"], 6)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {"fields": {}, "extensions": {}})
+
+    def test_field_evaluated_signal(self):
+        received = []
+
+        def receiver(sender, field, duration, results, **kwargs):
+            received.append((sender, field.name, results))
+
+        signals.field_evaluated.connect(receiver)
+        self.addCleanup(signals.field_evaluated.disconnect, receiver)
+        NumbersExample.create_from_string(self.numbers_xml).all_numbers
+        self.assertEqual(received, [(NumbersExample, "all_numbers", 3)])
+
+    def test_disabled(self):
+        metrics.disable()
+        NumbersExample.create_from_string(self.numbers_xml).all_numbers
+        self.assertEqual(metrics.snapshot(), {"fields": {}, "extensions": {}})
@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+import os
+import threading
+
+from django import test
+from lxml import etree
+
+from djxml.xmlmodels.planner import split_location_path
+from tests.xmlmodels import AtomEntryDetails, NestedSection, UnplannedAtomEntryDetails
+
+ATOM_FEED_FILE = os.path.join(os.path.dirname(__file__), "data", "atom_feed.xml")
+
+ENTRY_PREFIX = "//atom:entry[atom:link/@rel='alternate']"
+
+FEED_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example Feed</title>
+  %s
+</feed>"""
+
+ENTRY_TEMPLATE = """
+  <entry>
+    <title>Entry %(n)d</title>
+    <link rel="alternate" href="http://example.org/%(n)d"/>
+    <id>urn:entry:%(n)d</id>
+  </entry>"""
+
+
+def make_feed(num_entries):
+    return FEED_TEMPLATE % "".join(ENTRY_TEMPLATE % {"n": n} for n in range(num_entries))
+
+
+class TestPlanner(test.TestCase):
+    def setUp(self):
+        AtomEntryDetails._meta.multiple_node_prefixes.clear()
+
+    def assertSameValues(self, instance):
+        expected = UnplannedAtomEntryDetails(instance.root)
+        for name in ("titles", "ids", "summaries"):
+            self.assertEqual(getattr(instance, name), getattr(expected, name))
+
+    def test_split_location_path(self):
+        self.assertEqual(split_location_path("/a/b"), ["", "a", "b"])
+        self.assertEqual(split_location_path("//a/b[x='/']/@c"), ["", "", "a", "b[x='/']", "@c"])
+        self.assertIsNone(split_location_path("/a | /b"))
+        self.assertIsNone(split_location_path("count(/a/b)"))
+        self.assertIsNone(split_location_path("(/a/b)/text()"))
+        self.assertIsNone(split_location_path("/a[1]b"))
+
+    def test_plan(self):
+        opts = AtomEntryDetails._meta
+        self.assertEqual(list(opts.xpath_prefixes), [ENTRY_PREFIX])
+        self.assertIsNone(opts.get_field("feed_title").xpath_plan)
+        [(prefix, suffix)] = opts.get_field("titles").xpath_plan
+        self.assertEqual(prefix, ENTRY_PREFIX)
+        self.assertEqual(suffix.path, "atom:title")
+        for field in UnplannedAtomEntryDetails._meta.fields:
+            self.assertIsNone(getattr(field, "xpath_plan", None))
+
+    def test_single_node_prefix(self):
+        instance = AtomEntryDetails.create_from_file(ATOM_FEED_FILE)
+        self.assertEqual(instance.titles, ["An example entry"])
+        self.assertEqual(len(instance._prefix_nodes[ENTRY_PREFIX]), 1)
+        self.assertSameValues(instance)
+
+    def test_multiple_node_prefix(self):
+        instance = AtomEntryDetails.create_from_string(make_feed(3))
+        self.assertEqual(instance.titles, ["Entry 0", "Entry 1", "Entry 2"])
+        self.assertIsNone(instance._prefix_nodes[ENTRY_PREFIX])
+        self.assertIn(ENTRY_PREFIX, AtomEntryDetails._meta.multiple_node_prefixes)
+        self.assertSameValues(instance)
+
+        # Later instances skip the prefix
+        instance = AtomEntryDetails.create_from_string(make_feed(1))
+        self.assertEqual(instance.titles, ["Entry 0"])
+        self.assertNotIn(ENTRY_PREFIX, instance._prefix_nodes)
+
+    def test_empty_prefix(self):
+        instance = AtomEntryDetails.create_from_string(make_feed(0))
+        self.assertEqual(instance.ids, [])
+        self.assertEqual(instance._prefix_nodes[ENTRY_PREFIX], [])
+        self.assertEqual(instance.feed_title, "Example Feed")
+
+    def test_reentrant_suffix(self):
+        self.assertIsNotNone(NestedSection._meta.get_field("nested_titles").xpath_plan)
+        root = etree.Element("section", id="1")
+        title = etree.SubElement(
+            root, "title", nested="<section id='2'><title>Inner</title></section>"
+        )
+        title.text = "Outer"
+        instance = NestedSection(root)
+        titles = []
+        thread = threading.Thread(
+            target=lambda: titles.append(instance.nested_titles), daemon=True
+        )
+        thread.start()
+        thread.join(10)
+        self.assertEqual(titles, [["Outer"]])
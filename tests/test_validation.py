@@ -0,0 +1,96 @@
+from __future__ import absolute_import
+import os
+import tempfile
+from unittest import mock
+
+from lxml import etree
+from django import test
+
+from djxml.xmlmodels import bind, validation
+from djxml.xmlmodels.exceptions import XmlSchemaValidationError
+from tests.xmlmodels import ParseValidatedNumbers, PostValidatedNumbers, UnvalidatedNumbers
+
+VALID_XML = "<numbers><num>1</num><num>2</num></numbers>"
+INVALID_XML = "<numbers><num>1</num><num>two</num></numbers>"
+
+
+class TestValidation(test.TestCase):
+    def write_file(self, xml_source):
+        fd, path = tempfile.mkstemp(suffix=".xml")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, "w") as f:
+            f.write(xml_source)
+        return path
+
+    def test_post(self):
+        self.assertEqual(PostValidatedNumbers._meta.validation, validation.POST)
+        self.assertEqual(PostValidatedNumbers.create_from_string(VALID_XML).total, 3)
+        with self.assertRaises(XmlSchemaValidationError):
+            PostValidatedNumbers.create_from_string(INVALID_XML)
+        with self.assertRaises(XmlSchemaValidationError):
+            PostValidatedNumbers(etree.XML(INVALID_XML))
+
+    def test_parse(self):
+        self.assertEqual(ParseValidatedNumbers.create_from_string(VALID_XML).total, 3)
+        path = self.write_file(INVALID_XML)
+        for create in (
+            lambda: ParseValidatedNumbers.create_from_string(INVALID_XML),
+            lambda: ParseValidatedNumbers.create_from_bytes(INVALID_XML.encode()),
+            lambda: ParseValidatedNumbers.create_from_file(path),
+        ):
+            with self.assertRaises(XmlSchemaValidationError):
+                create()
+        # Trees which weren't parsed by the model are validated when assigned
+        with self.assertRaises(XmlSchemaValidationError):
+            ParseValidatedNumbers(etree.XML(INVALID_XML))
+        with self.assertRaises(XmlSchemaValidationError):
+            bind(etree.XML(INVALID_XML), ParseValidatedNumbers)
+        self.assertEqual(ParseValidatedNumbers(etree.XML(VALID_XML)).total, 3)
+
+    def test_parse_incremental(self):
+        path = self.write_file(INVALID_XML)
+        with self.assertRaises(XmlSchemaValidationError):
+            list(ParseValidatedNumbers.iter_from_file(path, "num"))
+        self.assertEqual(
+            len(list(ParseValidatedNumbers.iter_from_file(self.write_file(VALID_XML), "num"))), 2
+        )
+        parser = ParseValidatedNumbers.push_parser("num")
+        parser.feed(INVALID_XML.encode())
+        with self.assertRaises(XmlSchemaValidationError):
+            parser.close()
+
+    def test_parse_validates_once(self):
+        opts = ParseValidatedNumbers._meta
+        self.addCleanup(setattr, opts, "validation", opts.validation)
+        opts.validation = validation.sampled(0.5)
+        # The document isn't sampled a second time when the instance is
+        # created from the tree the model parsed
+        with mock.patch.object(validation.SampledValidation, "sample", side_effect=[False, True]):
+            ParseValidatedNumbers.create_from_string(INVALID_XML)
+
+    def test_parse_syntax_error(self):
+        with self.assertRaises(etree.XMLSyntaxError):
+            ParseValidatedNumbers.create_from_string("<numbers><num>1</num>")
+
+    def test_off(self):
+        self.assertEqual(
+            UnvalidatedNumbers.create_from_string(INVALID_XML).xpath("count(//num)"), 2
+        )
+
+    def test_sampled(self):
+        opts = ParseValidatedNumbers._meta
+        self.addCleanup(setattr, opts, "validation", opts.validation)
+        opts.validation = validation.sampled(0)
+        ParseValidatedNumbers.create_from_string(INVALID_XML)
+        opts.validation = validation.sampled(1)
+        with self.assertRaises(XmlSchemaValidationError):
+            ParseValidatedNumbers.create_from_string(INVALID_XML)
+        with self.assertRaises(ValueError):
+            validation.sampled(1.5)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(TypeError):
+
+            class BadValidationNumbers(PostValidatedNumbers):
+                class Meta:
+                    validation = "sometimes"
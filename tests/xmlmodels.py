@@ -33,15 +33,35 @@ class NumbersExample(xmlmodels.XmlModel):
         return squares
 
 
-strip_namespaces = etree.XSLT(
-    etree.XML("""
+class NestedNode(xmlmodels.XmlModel):
+    class Meta:
+        extension_ns_uri = "urn:local:node-functions"
+        namespaces = {
+            "fn": extension_ns_uri,
+        }
+
+    depth = xmlmodels.XPathIntegerField("fn:child_depth(.)")
+
+    @xmlmodels.lxml_extension
+    def xpath_depth(self, context, nodes):
+        # As child_depth(), through XmlModel.xpath()
+        children = nodes[0].findall("node")
+        return 1 + max([NestedNode(c).xpath("fn:xpath_depth(.)") for c in children], default=0)
+
+    @xmlmodels.lxml_extension
+    def child_depth(self, context, nodes):
+        # Reads the same field of a nested instance of the model while the
+        # field is being evaluated
+        return 1 + max([NestedNode(child).depth for child in nodes[0].findall("node")], default=0)
+
+
+strip_namespaces = etree.XSLT(etree.XML("""
 <x:stylesheet version="1.0" xmlns:x="http://www.w3.org/1999/XSL/Transform"
               xmlns:xhtml="http://www.w3.org/1999/xhtml">
   <x:output encoding="utf-8" method="xml"/>
   <x:template match="@*|node()"><x:copy><x:apply-templates/></x:copy></x:template>
   <x:template match="xhtml:*"><x:element name="{local-name()}"><x:apply-templates/></x:element></x:template>
-</x:stylesheet>""")
-)
+</x:stylesheet>"""))
 
 
 class AtomEntry(xmlmodels.XmlModel):
@@ -97,3 +117,180 @@ class AtomFeed(xmlmodels.XmlModel):
         dt = datetime(*[t for t in time.strptime(dt_str, "%Y-%m-%dT%H:%M:%S")][0:6])
         tz_str = "Z" if tz_str == "Z" else tz_str[:3] + tz_str[4:]
         return dt.strftime("%a, %d %b %Y %H:%M:%S") + tz_str
+
+
+class DatesExample(xmlmodels.XmlModel):
+    iso_dates = xmlmodels.XPathDateTimeListField("//iso")
+    rfc822_date = xmlmodels.XPathDateTimeField("//rfc822", format="rfc822")
+    custom_date = xmlmodels.XPathDateTimeField("//custom", format="%d/%m/%Y")
+
+
+class ArraysExample(xmlmodels.XmlModel):
+    class Meta:
+        extension_ns_uri = "urn:local:array-functions"
+        namespaces = {
+            "fn": extension_ns_uri,
+        }
+
+    integers = xmlmodels.XPathIntegerArrayField("//v")
+    floats = xmlmodels.XPathFloatArrayField("//v")
+    text_integers = xmlmodels.XPathIntegerArrayField("//v", text_nodes=True)
+    attribute_integers = xmlmodels.XPathIntegerArrayField("//v/@n", text_nodes=True)
+    halves = xmlmodels.XPathFloatArrayField("fn:halve(//v)", text_nodes=True)
+
+    @xmlmodels.lxml_extension
+    def halve(self, context, nodes):
+        return [repr(int(n.text) / 2) for n in nodes]
+
+
+class CachedNumbers(xmlmodels.XmlModel):
+    class Meta:
+        value_cache = xmlmodels.ValueCache(max_bytes=16 * 1024)
+
+    total = xmlmodels.XPathIntegerField("sum(//num)")
+    all_numbers = xmlmodels.XPathIntegerListField("//num")
+    nodes = xmlmodels.XPathListField("//num")
+
+
+class StoredNumbers(xmlmodels.XmlModel):
+    # The tests set a Meta.file_value_store in a temporary directory
+    total = xmlmodels.XPathIntegerField("sum(//num)")
+    all_numbers = xmlmodels.XPathIntegerListField("//num")
+    # An lxml parser has no representation stable across processes, so the
+    # field's values aren't stored
+    first_number = xmlmodels.XPathIntegerField("//num[1]", parser=etree.XMLParser())
+
+
+class CompactAtomEntry(xmlmodels.XmlModel):
+    class Meta:
+        compact = True
+        namespaces = {
+            "atom": "http://www.w3.org/2005/Atom",
+        }
+
+    title = xmlmodels.XPathTextField("atom:title")
+    updated = xmlmodels.XPathDateTimeField("atom:updated")
+
+
+class CompactAtomFeed(xmlmodels.XmlModel):
+    class Meta:
+        compact = True
+        value_cache = xmlmodels.ValueCache(max_bytes=16 * 1024)
+        namespaces = {
+            "atom": "http://www.w3.org/2005/Atom",
+        }
+
+    title = xmlmodels.XPathTextField("/atom:feed/atom:title")
+    entries = xmlmodels.EmbeddedXPathListField(
+        CompactAtomEntry, "/atom:feed/atom:entry", required=False
+    )
+    copy = xmlmodels.XsltField(xslt_string="""
+        <xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+          <xsl:template match="/"><xsl:copy-of select="."/></xsl:template>
+        </xsl:stylesheet>""")
+
+
+class CompactAtomFeedSubclass(CompactAtomFeed):
+    feed_id = xmlmodels.XPathTextField("/atom:feed/atom:id")
+
+
+NUMBERS_XSD_SOURCE = """
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="numbers">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="num" type="xs:integer" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>"""
+
+NUMBERS_XSD = etree.XMLSchema(etree.XML(NUMBERS_XSD_SOURCE))
+
+
+class PostValidatedNumbers(xmlmodels.XmlModel):
+    class Meta:
+        xsd_schema = NUMBERS_XSD
+
+    total = xmlmodels.XPathIntegerField("sum(//num)")
+
+
+class ParseValidatedNumbers(PostValidatedNumbers):
+    class Meta:
+        validation = xmlmodels.validation.PARSE
+
+
+class UnvalidatedNumbers(PostValidatedNumbers):
+    class Meta:
+        validation = xmlmodels.validation.OFF
+
+
+NUMBERS_SCHEMATRON = """
+<schema xmlns="http://purl.oclc.org/dsdl/schematron">
+  <pattern>
+    <rule context="num">
+      <assert test="number(.) &gt; 0">A number must be positive</assert>
+    </rule>
+  </pattern>
+</schema>"""
+
+
+class SchematronNumbers(xmlmodels.XmlModel):
+    validate = xmlmodels.SchematronField(schematron_string=NUMBERS_SCHEMATRON)
+
+
+class OtherSchematronNumbers(xmlmodels.XmlModel):
+    check = xmlmodels.SchematronField(schematron_string=NUMBERS_SCHEMATRON)
+
+
+class AtomEntryDetails(xmlmodels.XmlModel):
+    class Meta:
+        namespaces = {
+            "atom": "http://www.w3.org/2005/Atom",
+        }
+
+    feed_title = xmlmodels.XPathTextField("/atom:feed/atom:title")
+    titles = xmlmodels.XPathTextListField("//atom:entry[atom:link/@rel='alternate']/atom:title")
+    ids = xmlmodels.XPathTextListField(
+        "//atom:entry[atom:link/@rel='alternate']/atom:id", required=False
+    )
+    summaries = xmlmodels.XPathInnerHtmlListField(
+        "//atom:entry[atom:link/@rel='alternate']/atom:summary/*", required=False
+    )
+
+
+class UnplannedAtomEntryDetails(AtomEntryDetails):
+    class Meta:
+        xpath_planner = False
+
+
+class NestedSection(xmlmodels.XmlModel):
+    class Meta:
+        extension_ns_uri = "urn:local:section-functions"
+        namespaces = {
+            "fn": extension_ns_uri,
+        }
+
+    title = xmlmodels.XPathTextField("//section[@id]/title")
+    nested_titles = xmlmodels.XPathTextListField("//section[@id]/title[fn:has_nested_title(.)]")
+
+    @xmlmodels.lxml_extension
+    def has_nested_title(self, context, nodes):
+        # Reads the same planned field of the document in the "nested"
+        # attribute while the field is being evaluated
+        nested = nodes[0].get("nested")
+        return nested is None or bool(NestedSection.create_from_string(nested).nested_titles)
+
+
+class AtomEntryLinks(xmlmodels.XmlModel):
+    class Meta:
+        namespaces = {
+            "atom": "http://www.w3.org/2005/Atom",
+        }
+
+    hrefs = xmlmodels.XPathTextListField(
+        "//atom:entry[atom:link/@rel='alternate']/atom:link/@href"
+    )
+    types = xmlmodels.XPathTextListField(
+        "//atom:entry[atom:link/@rel='alternate']/atom:link/@type", required=False
+    )